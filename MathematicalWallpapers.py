@@ -12,10 +12,24 @@ Version: Complete Edition
 """
 
 import numpy as np
-from PIL import Image, ImageDraw, ImageFont
-import random
+from PIL import Image, ImageDraw, ImageFont, features
+from concurrent.futures import ProcessPoolExecutor
+from decimal import Decimal, localcontext
+from functools import lru_cache, partial
+from multiprocessing import shared_memory
+import argparse
+import collections
+import inspect
+import itertools
 import math
 import os
+import shutil
+import struct
+import subprocess
+import sys
+import tempfile
+import weakref
+import zlib
 
 def add_signature_to_image(draw, image_size, signature="@aeronautyy", font_size=None,
                            fill=(255, 255, 255), outline_color=(0, 0, 0), outline_width=1):
@@ -62,487 +76,2039 @@ def random_function2(x: float, y: float) -> float:
     """Compute a second color factor using sine and cosine of scaled inputs."""
     return np.sin(np.pi * x) * np.cos(np.pi * y)
 
+def linear_gradient(ratio, start, end):
+    """Interpolate RGB colors from start to end for an array of ratios in [0, 1]."""
+    ratio = np.asarray(ratio, dtype=np.float64)[..., np.newaxis]
+    start = np.asarray(start, dtype=np.float64)
+    end = np.asarray(end, dtype=np.float64)
+    return (start + (end - start) * ratio).astype(np.uint8)
+
+def rainbow_gradient(ratio):
+    """Sweep the full hue circle (red -> green -> blue -> red) for ratios in [0, 1]."""
+    hue = np.asarray(ratio, dtype=np.float64) * 360
+    sections = [hue < 60, hue < 120, hue < 180, hue < 240, hue < 300]
+    rgb = np.empty(hue.shape + (3,), dtype=np.uint8)
+    rgb[..., 0] = np.select(sections, [255, 255 * (120 - hue) / 60, 0, 0,
+                                       255 * (hue - 240) / 60], 255)
+    rgb[..., 1] = np.select(sections, [255 * hue / 60, 255, 255,
+                                       255 * (240 - hue) / 60, 0], 0)
+    rgb[..., 2] = np.select(sections, [0, 0, 255 * (hue - 120) / 60, 255, 255],
+                            255 * (360 - hue) / 60)
+    return rgb
+
+def lava_gradient(ratio):
+    """Black through red to yellow, the molten look of the Burning Ship."""
+    ratio = np.asarray(ratio, dtype=np.float64)
+    rgb = np.empty(ratio.shape + (3,), dtype=np.uint8)
+    rgb[..., 0] = (255 * np.minimum(1, ratio * 2)).astype(np.uint8)
+    rgb[..., 1] = (255 * np.maximum(0, ratio - 0.5) * 2).astype(np.uint8)
+    rgb[..., 2] = (50 * ratio).astype(np.uint8)
+    return rgb
+
+# ============================================================================
+# PALETTES
+# ============================================================================
+
+PALETTES = {
+    'purple_white': partial(linear_gradient, start=(128, 0, 128), end=(255, 255, 255)),
+    'cyan_magenta': partial(linear_gradient, start=(0, 255, 255), end=(255, 0, 255)),
+    'deep_blue': partial(linear_gradient, start=(0, 0, 128), end=(128, 191, 255)),
+    'navy_cyan': partial(linear_gradient, start=(0, 0, 139), end=(139, 255, 255)),
+    'red_yellow': partial(linear_gradient, start=(139, 0, 0), end=(255, 255, 0)),
+    'fern_green': partial(linear_gradient, start=(0, 50, 0), end=(50, 238, 144)),
+    'turquoise_white': partial(linear_gradient, start=(64, 224, 208), end=(255, 255, 255)),
+    'electric_blue': partial(linear_gradient, start=(0, 100, 255), end=(100, 255, 255)),
+    'cosmic': partial(linear_gradient, start=(75, 0, 130), end=(255, 215, 0)),
+    'neon': partial(linear_gradient, start=(0, 255, 127), end=(64, 224, 255)),
+    'phoenix': partial(linear_gradient, start=(255, 0, 0), end=(255, 255, 50)),
+    'aurora': partial(linear_gradient, start=(0, 255, 100), end=(100, 155, 255)),
+    'ice': partial(linear_gradient, start=(100, 150, 255), end=(255, 255, 255)),
+    'green_magenta': partial(linear_gradient, start=(100, 255, 100), end=(255, 100, 255)),
+    'gingerbread': partial(linear_gradient, start=(139, 69, 19), end=(255, 215, 100)),
+    'fairy_dust': partial(linear_gradient, start=(255, 105, 180), end=(255, 255, 0)),
+    'orange_blue': partial(linear_gradient, start=(255, 165, 0), end=(0, 0, 255)),
+    'rainbow': rainbow_gradient,
+    'lava': lava_gradient,
+}
+
+@lru_cache(maxsize=None)
+def palette_lut(name, size=4096):
+    """Read-only (size, 3) uint8 table of a named palette sampled from 0 to 1."""
+    if name not in PALETTES:
+        raise ValueError(f"Unknown palette {name!r}; choose from {', '.join(PALETTES)}")
+    lut = PALETTES[name](np.linspace(0.0, 1.0, size))
+    lut.flags.writeable = False
+    return lut
+
+def apply_palette(ratio, palette, size=4096):
+    """Color an array of ratios in [0, 1] by indexing the palette's lookup table."""
+    index = np.clip(np.asarray(ratio, dtype=np.float64) * (size - 1) + 0.5, 0, size - 1)
+    return palette_lut(palette, size)[index.astype(np.intp)]
+
+def as_colorizer(colorize):
+    """Accept a palette name or a ratio -> RGB function wherever colors are needed."""
+    if isinstance(colorize, str):
+        return partial(apply_palette, palette=colorize)
+    return colorize
+
+# ============================================================================
+# SUPERSAMPLING
+# ============================================================================
+
+RESAMPLE_FILTERS = ("box", "lanczos")
+
+def scale_size(image_size, factor):
+    """(width, height) of image_size enlarged by an integer factor."""
+    return image_size[0] * factor, image_size[1] * factor
+
+def downsample(pixels, factor, resample="lanczos", top=0, height=None):
+    """
+    Shrinks supersampled RGB pixels by an integer factor.
+
+    "box" averages every factor x factor cell; "lanczos" filters with PIL's
+    Lanczos kernel, which also reads pixels just outside each cell. To
+    downsample a band of a larger image, pass the band with some extra rows
+    above and below: the result covers height output rows starting at
+    input row top, and the filter uses the extra rows as context.
+    """
+    if resample not in RESAMPLE_FILTERS:
+        raise ValueError(f"Unknown resample {resample!r}; use one of {', '.join(RESAMPLE_FILTERS)}")
+    width = pixels.shape[1] // factor
+    if height is None:
+        height = (pixels.shape[0] - top) // factor
+    if resample == "box":
+        cells = pixels[top:top + height * factor, :width * factor].reshape(
+            height, factor, width, factor, 3)
+        total = cells.sum(axis=(1, 3), dtype=np.uint32)
+        return ((total + factor * factor // 2) // (factor * factor)).astype(np.uint8)
+
+    img = Image.fromarray(np.ascontiguousarray(pixels), "RGB")
+    return np.asarray(img.resize((width, height), Image.Resampling.LANCZOS,
+                                 box=(0, top, width * factor, top + height * factor)))
+
+def downsample_frame(frame, factor, resample="lanczos"):
+    """downsample a whole supersampled frame, a strip at a time so frame can be an np.memmap."""
+    height, width = frame.shape[0] // factor, frame.shape[1] // factor
+    small = allocate_buffer((height, width, 3), np.uint8)
+    rows = strip_rows(width * factor * factor)
+    for start in range(0, height, rows):
+        stop = min(start + rows, height)
+        small[start:stop] = supersampled_band(lambda top, bottom: frame[top:bottom], factor,
+                                              resample, height, start, stop)
+    return small
+
+# ============================================================================
+# LARGE FRAMEBUFFERS
+# ============================================================================
+
+# Buffers bigger than this many bytes live in temporary files mapped with
+# np.memmap instead of RAM, so print-size renders are limited by disk space.
+# WALLPAPER_MEMMAP_DIR picks the directory (default: the system temp dir).
+MEMMAP_THRESHOLD = int(float(os.environ.get("WALLPAPER_MEMMAP_THRESHOLD_MB", 1024)) * (1 << 20))
+MEMMAP_DIR = os.environ.get("WALLPAPER_MEMMAP_DIR")
+
+# Whole-frame passes over a buffer work through strips of about this many pixels
+STRIP_PIXELS = 1 << 22
+
+def allocate_buffer(shape, dtype):
+    """
+    Zero-filled array for a render buffer, memory-mapped from a temporary
+    file when it is larger than MEMMAP_THRESHOLD. The file is removed once
+    the array is garbage collected.
+    """
+    dtype = np.dtype(dtype)
+    if math.prod(shape) * dtype.itemsize <= MEMMAP_THRESHOLD:
+        return np.zeros(shape, dtype=dtype)
+    handle, path = tempfile.mkstemp(suffix=".framebuffer", dir=MEMMAP_DIR)
+    os.close(handle)
+    buffer = np.memmap(path, dtype=dtype, mode="w+", shape=shape)
+    weakref.finalize(buffer, _remove_file, path)
+    return buffer
+
+def _remove_file(path):
+    """Delete a temporary buffer file, leaving it if the OS still holds it open."""
+    try:
+        os.remove(path)
+    except OSError:
+        pass
+
+def strip_rows(width, pixels=STRIP_PIXELS):
+    """Rows per strip for whole-frame passes over an image width pixels wide."""
+    return max(1, pixels // max(1, width))
+
+def _png_chunk(kind, data):
+    return struct.pack(">I", len(data)) + kind + data + struct.pack(">I", zlib.crc32(kind + data))
+
+def write_png_strips(frame, output_file, dpi=None, compress_level=6):
+    """
+    Writes an RGB array as a PNG, reading and compressing it a strip at a
+    time so the whole image never has to be in memory (frame can be an
+    np.memmap). Rows use the Paeth filter.
+    """
+    height, width = frame.shape[:2]
+    rows_per_strip = strip_rows(width)
+    compressor = zlib.compressobj(compress_level)
+    with open(output_file, "wb") as f:
+        f.write(b"\x89PNG\r\n\x1a\n")
+        f.write(_png_chunk(b"IHDR", struct.pack(">IIBBBBB", width, height, 8, 2, 0, 0, 0)))
+        if dpi is not None:
+            per_meter = [int(value / 0.0254 + 0.5) for value in dpi]
+            f.write(_png_chunk(b"pHYs", struct.pack(">IIB", *per_meter, 1)))
+
+        previous = np.zeros((1, width * 3), dtype=np.int16)
+        for start in range(0, height, rows_per_strip):
+            rows = np.asarray(frame[start:start + rows_per_strip]).reshape(-1, width * 3)
+            x = rows.astype(np.int16)
+            up = np.vstack([previous, x[:-1]])
+            left = np.zeros_like(x)
+            left[:, 3:] = x[:, :-3]
+            up_left = np.zeros_like(x)
+            up_left[:, 3:] = up[:, :-3]
+            estimate = left + up - up_left
+            to_left, to_up, to_up_left = (np.abs(estimate - v) for v in (left, up, up_left))
+            predictor = np.where((to_left <= to_up) & (to_left <= to_up_left), left,
+                                 np.where(to_up <= to_up_left, up, up_left))
+            filtered = np.empty((x.shape[0], width * 3 + 1), dtype=np.uint8)
+            filtered[:, 0] = 4
+            filtered[:, 1:] = (x - predictor) & 0xFF
+            previous = x[-1:]
+            data = compressor.compress(filtered.tobytes())
+            if data:
+                f.write(_png_chunk(b"IDAT", data))
+        f.write(_png_chunk(b"IDAT", compressor.flush()))
+        f.write(_png_chunk(b"IEND", b""))
+
+def write_tiff_strips(frame, output_file, dpi=None, compress_level=6):
+    """
+    Writes an RGB array as a Deflate-compressed TIFF, one strip at a time,
+    so the whole image never has to be in memory (frame can be an np.memmap).
+    """
+    height, width = frame.shape[:2]
+    rows_per_strip = strip_rows(width)
+    offsets, byte_counts = [], []
+    with open(output_file, "wb") as f:
+        f.write(b"II*\x00\x00\x00\x00\x00")
+        for start in range(0, height, rows_per_strip):
+            data = zlib.compress(np.ascontiguousarray(frame[start:start + rows_per_strip]).tobytes(),
+                                 compress_level)
+            offsets.append(f.tell())
+            byte_counts.append(len(data))
+            f.write(data)
+
+        # Out-of-line tag values, then the image file directory that points at them
+        if f.tell() % 2:
+            f.write(b"\x00")
+        bits_offset = f.tell()
+        f.write(struct.pack("<3H", 8, 8, 8))
+        offsets_offset = f.tell()
+        f.write(struct.pack(f"<{len(offsets)}I", *offsets))
+        counts_offset = f.tell()
+        f.write(struct.pack(f"<{len(byte_counts)}I", *byte_counts))
+        resolution_offset = f.tell()
+        x_dpi, y_dpi = dpi if dpi is not None else (72, 72)
+        f.write(struct.pack("<4I", int(x_dpi), 1, int(y_dpi), 1))
+        if f.tell() > 0xFFFFFFFF:
+            raise ValueError(f"{output_file} is too large for a classic TIFF; write a PNG instead")
+
+        single = len(offsets) == 1
+        tags = [
+            (256, 4, 1, width), (257, 4, 1, height), (258, 3, 3, bits_offset),
+            (259, 3, 1, 8), (262, 3, 1, 2),
+            (273, 4, len(offsets), offsets[0] if single else offsets_offset),
+            (277, 3, 1, 3), (278, 4, 1, rows_per_strip),
+            (279, 4, len(byte_counts), byte_counts[0] if single else counts_offset),
+            (282, 5, 1, resolution_offset), (283, 5, 1, resolution_offset + 8),
+            (284, 3, 1, 1), (296, 3, 1, 2),
+        ]
+        directory_offset = f.tell()
+        f.write(struct.pack("<H", len(tags)))
+        for tag, kind, count, value in tags:
+            packed = struct.pack("<H", value) + b"\x00\x00" if kind == 3 and count == 1 \
+                else struct.pack("<I", value)
+            f.write(struct.pack("<HHI", tag, kind, count) + packed)
+        f.write(struct.pack("<I", 0))
+        f.seek(4)
+        f.write(struct.pack("<I", directory_offset))
+
+STRIP_WRITERS = {
+    '.png': write_png_strips,
+    '.tif': write_tiff_strips,
+    '.tiff': write_tiff_strips,
+}
+
+def sign_frame_corner(frame):
+    """Adds the signature to a framebuffer in place, drawing on its bottom-right corner only."""
+    height, width = frame.shape[:2]
+    font_size = int(height / 100)
+    corner = frame[-min(height, 4 * font_size + 60):, -min(width, 30 * font_size + 60):]
+    img = Image.fromarray(np.array(corner), "RGB")
+    add_signature_to_image(ImageDraw.Draw(img), img.size, font_size=font_size)
+    corner[...] = np.asarray(img)
+
+# ============================================================================
+# SAVE STAGE
+# ============================================================================
+
+# File extension -> (PIL format, PIL.features name the encoder needs, if any)
+IMAGE_FORMATS = {
+    '.png': ('PNG', None),
+    '.jpg': ('JPEG', 'jpg'),
+    '.jpeg': ('JPEG', 'jpg'),
+    '.webp': ('WEBP', 'webp'),
+    '.avif': ('AVIF', 'avif'),
+    '.tif': ('TIFF', None),
+    '.tiff': ('TIFF', None),
+}
+
+# How finish_wallpaper saves every image in this process (see configure_saving)
+SAVE_SETTINGS = {'quality': None, 'compress_level': None, 'draft': False, 'siblings': (),
+                 'variants': ()}
+
+# Downsized copies for the web gallery: name -> width in pixels
+VARIANT_WIDTHS = {'thumb': 640, '1080p': 1920, '1440p': 2560, '4k': 3840}
+
+def save_format(output_file):
+    """PIL format for a file name's extension; ValueError if this Pillow cannot write it."""
+    extension = os.path.splitext(output_file)[1].lower()
+    if extension not in IMAGE_FORMATS:
+        raise ValueError(f"Unsupported image format {extension!r}; "
+                         f"use one of {', '.join(IMAGE_FORMATS)}")
+    name, feature = IMAGE_FORMATS[extension]
+    if feature is not None and not features.check(feature):
+        raise ValueError(f"This Pillow build has no {name} encoder")
+    return name
+
+def encoder_options(name, quality=None, compress_level=None, draft=False):
+    """
+    Keyword arguments for PIL's save() in format name.
+
+    quality applies to JPEG, WebP and AVIF and compress_level (0-9) to PNG;
+    None picks a default suited to wallpapers. draft trades file size for
+    encoding speed: zlib level 1 with run-length matching for PNG, the
+    fastest method for WebP and AVIF, no compression for TIFF.
+    """
+    if name == "PNG":
+        if draft:
+            return {'compress_level': 1 if compress_level is None else compress_level,
+                    'compress_type': zlib.Z_RLE}
+        return {} if compress_level is None else {'compress_level': compress_level}
+    if name == "JPEG":
+        return {'quality': quality or (80 if draft else 92), 'subsampling': 2 if draft else 0}
+    if name == "WEBP":
+        return {'quality': quality or (80 if draft else 90), 'method': 0 if draft else 4}
+    if name == "AVIF":
+        return {'quality': quality or (60 if draft else 80), 'speed': 10 if draft else 6}
+    if name == "TIFF" and not draft and features.check("libtiff"):
+        return {'compression': 'tiff_adobe_deflate'}
+    return {}
+
+def configure_saving(quality=None, compress_level=None, draft=False, siblings=(), variants=()):
+    """
+    Sets how this process saves wallpapers.
+
+    siblings lists extra formats ("webp", "avif", ...) that finish_wallpaper
+    writes next to every image, encoded from the same pixels; they are
+    checked here so a missing encoder fails before any rendering. variants
+    names VARIANT_WIDTHS sizes ("all" for every one) written as downsized
+    copies in the image's format and each sibling format.
+    """
+    siblings = tuple(extension.lower().lstrip(".") for extension in siblings)
+    for extension in siblings:
+        save_format(f"sibling.{extension}")
+    variants = tuple(VARIANT_WIDTHS) if "all" in variants else tuple(variants)
+    unknown = [variant for variant in variants if variant not in VARIANT_WIDTHS]
+    if unknown:
+        raise ValueError(f"Unknown variant(s) {', '.join(unknown)}; "
+                         f"use {', '.join(VARIANT_WIDTHS)} or all")
+    SAVE_SETTINGS.update(quality=quality, compress_level=compress_level, draft=draft,
+                         siblings=siblings, variants=variants)
+
+def sibling_files(output_file, siblings=None):
+    """Paths of the sibling images written next to output_file."""
+    base, extension = os.path.splitext(output_file)
+    siblings = SAVE_SETTINGS['siblings'] if siblings is None else siblings
+    return [f"{base}.{sibling}" for sibling in siblings if f".{sibling}" != extension.lower()]
+
+def variant_files(output_file, image_width, variants=None, siblings=None):
+    """
+    Downsized copies of a image_width wide output_file, widest first, as
+    (width, paths) pairs: name-thumb.png, name-thumb.webp, ... Variants at
+    least as wide as the image would only be copies and are left out.
+    """
+    variants = SAVE_SETTINGS['variants'] if variants is None else variants
+    widths = sorted({VARIANT_WIDTHS[variant] for variant in variants}, reverse=True)
+    names = {width: name for name, width in VARIANT_WIDTHS.items()}
+    sources = [output_file] + sibling_files(output_file, siblings)
+    return [(width, [f"{base}-{names[width]}{extension}"
+                     for base, extension in map(os.path.splitext, sources)])
+            for width in widths if width < image_width]
+
+def save_variants(img, output_file, dpi=None, variants=None, siblings=None):
+    """
+    Writes the variant_files of img and returns their paths.
+
+    The sizes are made in one pass from the largest down, each resampled
+    (Lanczos) from the previous one rather than from the full image, so
+    the small sizes cost little more than the large one.
+    """
+    written = []
+    full_width, full_height = img.size
+    for width, paths in variant_files(output_file, full_width, variants, siblings):
+        img = img.resize((width, max(1, round(full_height * width / full_width))),
+                         Image.Resampling.LANCZOS)
+        for path in paths:
+            save_image(img, path, dpi)
+        written.extend(paths)
+    return written
+
+def save_image(img, output_file, dpi=None):
+    """Encodes a PIL image to output_file with the format options of SAVE_SETTINGS."""
+    options = encoder_options(save_format(output_file), SAVE_SETTINGS['quality'],
+                              SAVE_SETTINGS['compress_level'], SAVE_SETTINGS['draft'])
+    if dpi is not None:
+        options['dpi'] = dpi
+    img.save(output_file, **options)
+
+# ============================================================================
+# POINT RASTERIZER
+# ============================================================================
+
+def point_bounds(xs, ys):
+    """Bounding box (min_x, max_x, min_y, max_y) of a point cloud."""
+    return xs.min(), xs.max(), ys.min(), ys.max()
+
+def pixel_coordinates(xs, ys, image_size, bounds):
+    """Map point coordinates onto fractional pixel columns and rows, bounds spanning the image."""
+    width, height = image_size
+    min_x, max_x, min_y, max_y = bounds
+    range_x = max_x - min_x if max_x != min_x else 1e-6
+    range_y = max_y - min_y if max_y != min_y else 1e-6
+    return (xs - min_x) / range_x * (width - 1), (ys - min_y) / range_y * (height - 1)
+
+def scale_to_pixels(xs, ys, image_size, bounds):
+    """Map point coordinates onto integer pixel columns and rows of the image."""
+    x_coord, y_coord = pixel_coordinates(xs, ys, image_size, bounds)
+    return x_coord.astype(np.intp), y_coord.astype(np.intp)
+
+def rasterize_points(xs, ys, colors, image_size, bounds=None, frame=None):
+    """
+    Scatters colored points into an RGB framebuffer in one operation.
+
+    The point cloud is stretched so its bounding box fills the image, exactly
+    like the old per-point drawing loop. When several points land on the same
+    pixel the last one in the sequence wins. Points outside an explicitly given
+    bounds are dropped.
+    """
+    width, height = image_size
+    if bounds is None:
+        bounds = point_bounds(xs, ys)
+    if frame is None:
+        frame = allocate_buffer((height, width, 3), np.uint8)
+
+    x_coord, y_coord = scale_to_pixels(xs, ys, image_size, bounds)
+    inside = (x_coord >= 0) & (x_coord < width) & (y_coord >= 0) & (y_coord < height)
+    flat = (y_coord * width + x_coord)[inside]
+    return scatter_last(frame, flat, colors[inside])
+
+def scatter_last(frame, flat, colors):
+    """Write colors to flat pixel indices of frame; the last write to a pixel wins."""
+    # NumPy does not promise an order for repeated fancy-index writes, so keep
+    # only the final visit to every pixel before scattering.
+    _, last_from_end = np.unique(flat[::-1], return_index=True)
+    last = flat.size - 1 - last_from_end
+    frame.reshape(-1, 3)[flat[last]] = colors[last]
+    return frame
+
+def accumulate_density(xs, ys, image_size, bounds=None, counts=None):
+    """
+    Bins points into a per-pixel hit-count histogram.
+
+    Pass the counts array returned by a previous call to keep accumulating
+    more points into the same buffer.
+    """
+    width, height = image_size
+    if bounds is None:
+        bounds = point_bounds(xs, ys)
+    if counts is None:
+        counts = allocate_buffer((height, width), np.uint32)
+
+    x_coord, y_coord = scale_to_pixels(xs, ys, image_size, bounds)
+    inside = (x_coord >= 0) & (x_coord < width) & (y_coord >= 0) & (y_coord < height)
+    flat = (y_coord * width + x_coord)[inside]
+    if counts.size > 8 * flat.size:
+        # Few points on a big image: count only the pixels that were hit
+        pixels, hits = np.unique(flat, return_counts=True)
+        counts.reshape(-1)[pixels] += hits.astype(counts.dtype)
+    else:
+        hits = np.bincount(flat, minlength=width * height)
+        np.add(counts, hits.reshape(height, width), out=counts, casting="unsafe")
+    return counts
+
+def tone_map_density(counts, colorize, gamma=2.2):
+    """Log-scale hit counts, gamma-correct them and shade them through a palette."""
+    colorize = as_colorizer(colorize)
+    frame = allocate_buffer(counts.shape + (3,), np.uint8)
+    peak = counts.max()
+    if peak == 0:
+        return frame
+
+    rows = strip_rows(counts.shape[1])
+    for start in range(0, counts.shape[0], rows):
+        level = (np.log1p(counts[start:start + rows]) / np.log1p(peak)) ** (1 / gamma)
+        frame[start:start + rows] = colorize(level) * level[..., np.newaxis]
+    return frame
+
+def pilot_bounds(blocks, pilot_points=1 << 20):
+    """
+    Reads (xs, ys) blocks until pilot_points points have arrived and returns
+    the bounding box of those together with an iterator over all the blocks,
+    the buffered ones included. Empty blocks are skipped.
+    """
+    blocks = iter(blocks)
+    pilot, seen = [], 0
+    for xs, ys in blocks:
+        if xs.size:
+            pilot.append((xs, ys))
+            seen += xs.size
+        if seen >= pilot_points:
+            break
+    if not pilot:
+        raise ValueError("No points to render")
+    block_bounds = np.array([point_bounds(xs, ys) for xs, ys in pilot])
+    bounds = (block_bounds[:, 0].min(), block_bounds[:, 1].max(),
+              block_bounds[:, 2].min(), block_bounds[:, 3].max())
+    return itertools.chain(pilot, blocks), bounds
+
+def render_point_blocks(blocks, num_points, image_size, colorize, render_mode="points",
+                        gamma=2.2, pilot_points=1 << 20, supersample=1, resample="lanczos"):
+    """
+    Streams (xs, ys) blocks of a point sequence into a framebuffer.
+
+    In "points" mode each point takes the gradient color of its position in
+    the sequence and later points overwrite earlier ones. In "density" mode
+    every visit counts and the histogram is tone mapped through the gradient.
+
+    Blocks are held back until pilot_points points have arrived, which fixes
+    the bounding box; every later block is drawn as soon as it is produced,
+    so memory does not grow with num_points. Later points that fall outside
+    the pilot's bounding box are dropped. num_points is the length of the
+    sequence, which sets the gradient position of each point.
+    With supersample=k the points are drawn k times finer and the frame is
+    downsampled (see downsample), which antialiases them.
+    """
+    if render_mode not in ("points", "density"):
+        raise ValueError(f"Unknown render_mode {render_mode!r}; use 'points' or 'density'")
+    if supersample > 1:
+        frame = render_point_blocks(blocks, num_points, scale_size(image_size, supersample),
+                                    colorize, render_mode, gamma, pilot_points)
+        return downsample_frame(frame, supersample, resample)
+    colorize = as_colorizer(colorize)
+    blocks, bounds = pilot_bounds(blocks, pilot_points)
+
+    width, height = image_size
+    if render_mode == "points":
+        frame = allocate_buffer((height, width, 3), np.uint8)
+    else:
+        counts = allocate_buffer((height, width), np.uint32)
+    start = 0
+    for xs, ys in blocks:
+        if render_mode == "points":
+            colors = colorize((start + np.arange(xs.size)) / num_points)
+            rasterize_points(xs, ys, colors, image_size, bounds, frame)
+        else:
+            accumulate_density(xs, ys, image_size, bounds, counts)
+        start += xs.size
+
+    if render_mode == "density":
+        return tone_map_density(counts, colorize, gamma)
+    return frame
+
+# ============================================================================
+# 2D MAP ITERATION ENGINE
+# ============================================================================
+
+def clifford_step(x, y, a, b, c, d):
+    """Clifford map: x' = sin(ay) + c cos(ax), y' = sin(bx) + d cos(by)."""
+    return np.sin(a * y) + c * np.cos(a * x), np.sin(b * x) + d * np.cos(b * y)
+
+def dejong_step(x, y, a, b, c, d):
+    """de Jong map: x' = sin(ay) - cos(bx), y' = sin(cx) - cos(dy)."""
+    return np.sin(a * y) - np.cos(b * x), np.sin(c * x) - np.cos(d * y)
+
+def henon_step(x, y, a, b):
+    """Hénon map: x' = 1 - ax^2 + y, y' = bx."""
+    return 1 - a * x * x + y, b * x
+
+def ikeda_step(x, y, u):
+    """Ikeda map: a rotation by t = 0.4 - 6 / (1 + x^2 + y^2), scaled by u."""
+    t = 0.4 - 6 / (1 + x * x + y * y)
+    cos_t, sin_t = np.cos(t), np.sin(t)
+    return 1 + u * (x * cos_t - y * sin_t), u * (x * sin_t + y * cos_t)
+
+def gingerbreadman_step(x, y):
+    """Gingerbreadman map: x' = 1 - y + |x|, y' = x."""
+    return 1 - y + np.abs(x), x
+
+def tinkerbell_step(x, y, a, b, c, d):
+    """Tinkerbell map: x' = x^2 - y^2 + ax + by, y' = 2xy + cx + dy."""
+    return x * x - y * y + a * x + b * y, 2 * x * y + c * x + d * y
+
+def iterate_map_blocks(step, num_points, seed_point=(0.0, 0.0), num_orbits=1000,
+                       burn_in=100, spread=0.1, seed=0, block_size=1000000,
+                       escape_radius=1e6, **params):
+    """
+    Advances many orbits of a 2D map in lockstep and yields (xs, ys) blocks.
+
+    The orbits start scattered around seed_point, run burn_in steps to settle
+    onto the attractor, and are then sampled step by step until num_points
+    points have been produced. Orbits that leave escape_radius are dropped.
+    """
+    rng = np.random.default_rng(seed)
+    x = seed_point[0] + spread * rng.standard_normal(num_orbits)
+    y = seed_point[1] + spread * rng.standard_normal(num_orbits)
+
+    with np.errstate(over="ignore", invalid="ignore"):
+        for _ in range(burn_in):
+            x, y = step(x, y, **params)
+
+        produced = 0
+        while produced < num_points:
+            bounded = np.isfinite(x) & np.isfinite(y) & (np.abs(x) < escape_radius) \
+                & (np.abs(y) < escape_radius)
+            x, y = x[bounded], y[bounded]
+            if x.size == 0:
+                raise ValueError(f"Every orbit of {step.__name__} escaped; "
+                                 "try another seed_point or a smaller spread")
+
+            steps = max(1, min(block_size, num_points - produced) // x.size)
+            block_x = np.empty((steps, x.size))
+            block_y = np.empty((steps, x.size))
+            for i in range(steps):
+                x, y = step(x, y, **params)
+                block_x[i], block_y[i] = x, y
+
+            block_x, block_y = block_x.ravel(), block_y.ravel()
+            keep = np.isfinite(block_x) & np.isfinite(block_y) \
+                & (np.abs(block_x) < escape_radius) & (np.abs(block_y) < escape_radius)
+            block_x = block_x[keep][:num_points - produced]
+            block_y = block_y[keep][:num_points - produced]
+            produced += block_x.size
+            yield block_x, block_y
+
+def finish_wallpaper(frame, output_file, dpi, add_signature, preview, title):
+    """
+    Turn an RGB framebuffer into an image, sign it, save it and report.
+
+    The image is encoded as SAVE_SETTINGS says, together with its sibling
+    formats and downsized variants. A memory-mapped frame (see
+    allocate_buffer) saved as PNG or TIFF is signed and written strip by
+    strip without loading it into memory.
+    """
+    extension = os.path.splitext(output_file)[1].lower()
+    siblings = sibling_files(output_file)
+    has_copies = bool(siblings or variant_files(output_file, frame.shape[1]))
+    if isinstance(frame, np.memmap) and extension in STRIP_WRITERS:
+        if add_signature:
+            sign_frame_corner(frame)
+        compress_level = SAVE_SETTINGS['compress_level']
+        if compress_level is None:
+            compress_level = 1 if SAVE_SETTINGS['draft'] else 6
+        STRIP_WRITERS[extension](frame, output_file, dpi, compress_level)
+        img = Image.fromarray(np.asarray(frame), "RGB") if has_copies else None
+    else:
+        img = Image.fromarray(frame, "RGB")
+        if add_signature:
+            add_signature_to_image(ImageDraw.Draw(img), img.size)
+        save_image(img, output_file, dpi)
+
+    for sibling in siblings:
+        save_image(img, sibling, dpi)
+    variants = save_variants(img, output_file, dpi) if has_copies else []
+    if preview:
+        (Image.open(output_file) if img is None else img).show()
+    print(f"{title} saved as {', '.join([output_file] + siblings + variants)}")
+    return img
+
+# ============================================================================
+# ITERATED FUNCTION SYSTEMS (CHAOS GAME)
+# ============================================================================
+
+# Each system is (maps, probabilities); a map (a, b, c, d, e, f) sends
+# (x, y) to (ax + by + e, cx + dy + f).
+IFS_SYSTEMS = {
+    'barnsley_fern': (((0.0, 0.0, 0.0, 0.16, 0.0, 0.0),
+                       (0.85, 0.04, -0.04, 0.85, 0.0, 1.6),
+                       (0.2, -0.26, 0.23, 0.22, 0.0, 1.6),
+                       (-0.15, 0.28, 0.26, 0.24, 0.0, 0.44)),
+                      (0.01, 0.85, 0.07, 0.07)),
+    'sierpinski_triangle': (((0.5, 0.0, 0.0, 0.5, 0.0, 0.0),
+                             (0.5, 0.0, 0.0, 0.5, 0.5, 0.0),
+                             (0.5, 0.0, 0.0, 0.5, 0.25, math.sqrt(3) / 4)),
+                            (1 / 3, 1 / 3, 1 / 3)),
+    'heighway_dragon': (((0.5, -0.5, 0.5, 0.5, 0.0, 0.0),
+                         (-0.5, -0.5, 0.5, -0.5, 1.0, 0.0)),
+                        (0.5, 0.5)),
+    'maple_leaf': (((0.14, 0.01, 0.0, 0.51, -0.08, -1.31),
+                    (0.43, 0.52, -0.45, 0.5, 1.49, -0.75),
+                    (0.45, -0.49, 0.47, 0.47, -1.62, -0.74),
+                    (0.49, 0.0, 0.0, 0.51, 0.02, 1.62)),
+                   (0.1, 0.35, 0.35, 0.2)),
+}
+
+def iterate_ifs_blocks(maps, probabilities, num_points, num_chains=10000, burn_in=20, seed=0,
+                       block_size=1000000):
+    """
+    Plays the chaos game on many independent chains at once, yielding (xs, ys) blocks.
+
+    maps is a sequence of affine maps (a, b, c, d, e, f) and probabilities
+    the chance of picking each. Every step applies a randomly chosen map to
+    every chain; the choices for a whole block come from a single rng.choice
+    call. The chains start anywhere in the unit square and run burn_in steps
+    to contract onto the attractor before they are sampled.
+    """
+    a, b, c, d, e, f = np.asarray(maps, dtype=np.float64).T
+    probabilities = np.asarray(probabilities, dtype=np.float64)
+    probabilities = probabilities / probabilities.sum()
+    rng = np.random.default_rng(seed)
+    x, y = rng.random(num_chains), rng.random(num_chains)
+
+    for choice in rng.choice(len(probabilities), size=(burn_in, num_chains), p=probabilities):
+        x, y = a[choice] * x + b[choice] * y + e[choice], c[choice] * x + d[choice] * y + f[choice]
+
+    produced = 0
+    while produced < num_points:
+        steps = -(-min(block_size, num_points - produced) // num_chains)
+        choices = rng.choice(len(probabilities), size=(steps, num_chains), p=probabilities)
+        block_x = np.empty((steps, num_chains))
+        block_y = np.empty((steps, num_chains))
+        for i, choice in enumerate(choices):
+            x, y = a[choice] * x + b[choice] * y + e[choice], c[choice] * x + d[choice] * y + f[choice]
+            block_x[i], block_y[i] = x, y
+
+        block_x = block_x.ravel()[:num_points - produced]
+        block_y = block_y.ravel()[:num_points - produced]
+        produced += block_x.size
+        yield block_x, block_y
+
+# ============================================================================
+# PARAMETRIC CURVES
+# ============================================================================
+
+def parametric_blocks(curve, t_start, t_stop, num_points, block_size=1 << 20):
+    """
+    Evaluates curve(t) -> (xs, ys) at num_points evenly spaced parameters from
+    t_start to t_stop inclusive, yielding the points in blocks.
+    """
+    step = (t_stop - t_start) / max(num_points - 1, 1)
+    for start in range(0, num_points, block_size):
+        t = np.arange(start, min(start + block_size, num_points)) * step + t_start
+        yield curve(t)
+
+def draw_polyline(xs, ys, ratios, image_size, bounds, coverage, color_sum, colorize,
+                  samples_per_pixel=2):
+    """
+    Draws the connected segments through the points into coverage buffers.
+
+    Every segment is sampled samples_per_pixel times per pixel of its length
+    and each sample is split over its four nearest pixels with bilinear
+    weights (Wu-style antialiasing), all segments at once. coverage collects
+    how much line length crosses every pixel and color_sum the same weights
+    times the color, which is interpolated along each segment from the
+    palette positions in ratios.
+    """
+    width, height = image_size
+    px, py = pixel_coordinates(xs, ys, image_size, bounds)
+    dx, dy = np.diff(px), np.diff(py)
+    length = np.hypot(dx, dy)
+    steps = np.maximum(1, np.ceil(length * samples_per_pixel)).astype(np.intp)
+    segment = np.repeat(np.arange(steps.size), steps)
+    first = np.cumsum(steps) - steps
+    frac = (np.arange(segment.size) - first[segment]) / steps[segment]
+
+    sx = px[segment] + dx[segment] * frac
+    sy = py[segment] + dy[segment] * frac
+    weight = length[segment] / steps[segment]
+    ratio = ratios[segment] + (ratios[segment + 1] - ratios[segment]) * frac
+    colors = colorize(ratio)
+
+    x0, y0 = np.floor(sx), np.floor(sy)
+    fx, fy = sx - x0, sy - y0
+    x0, y0 = x0.astype(np.intp), y0.astype(np.intp)
+    index, weights, sample = [], [], []
+    for ox, oy, corner in ((0, 0, (1 - fx) * (1 - fy)), (1, 0, fx * (1 - fy)),
+                           (0, 1, (1 - fx) * fy), (1, 1, fx * fy)):
+        x, y = x0 + ox, y0 + oy
+        inside = (x >= 0) & (x < width) & (y >= 0) & (y < height) & (corner > 0)
+        index.append((y * width + x)[inside])
+        weights.append((weight * corner)[inside])
+        sample.append(np.flatnonzero(inside))
+    index, weights, sample = map(np.concatenate, (index, weights, sample))
+
+    # Sum per pixel over the touched pixels only, so the work scales with the curve
+    pixels, slot = np.unique(index, return_inverse=True)
+    coverage.reshape(-1)[pixels] += np.bincount(slot, weights)
+    for channel in range(3):
+        color_sum.reshape(-1, 3)[pixels, channel] += np.bincount(
+            slot, weights * colors[sample, channel])
+
+def render_curve_blocks(blocks, num_points, image_size, colorize, pilot_points=1 << 20,
+                        supersample=1, resample="lanczos"):
+    """
+    Draws a streamed point sequence as one antialiased polyline.
+
+    Like render_point_blocks, the first pilot_points points fix the bounding
+    box and num_points sets the gradient position of each point. Where the
+    line crosses a pixel only partly it is blended into the black background,
+    and where it crosses itself the colors are averaged. supersample works as
+    in render_point_blocks and makes the line 1 / supersample pixels wide.
+    """
+    if supersample > 1:
+        frame = render_curve_blocks(blocks, num_points, scale_size(image_size, supersample),
+                                    colorize, pilot_points)
+        return downsample_frame(frame, supersample, resample)
+    colorize = as_colorizer(colorize)
+    blocks, bounds = pilot_bounds(blocks, pilot_points)
+
+    width, height = image_size
+    coverage = allocate_buffer((height, width), np.float32)
+    color_sum = allocate_buffer((height, width, 3), np.float32)
+    start, previous = 0, None
+    for xs, ys in blocks:
+        if xs.size == 0:
+            continue
+        ratios = (start + np.arange(xs.size)) / num_points
+        start += xs.size
+        if previous is not None:
+            xs, ys, ratios = (np.concatenate(([p], v)) for p, v in zip(previous, (xs, ys, ratios)))
+        previous = xs[-1], ys[-1], ratios[-1]
+        draw_polyline(xs, ys, ratios, image_size, bounds, coverage, color_sum, colorize)
+
+    frame = allocate_buffer((height, width, 3), np.uint8)
+    rows = strip_rows(width)
+    for start in range(0, height, rows):
+        strip = frame[start:start + rows].reshape(-1, 3)
+        lit = np.flatnonzero(coverage[start:start + rows])
+        covered = coverage[start:start + rows].reshape(-1)[lit]
+        shade = (np.minimum(covered, 1.0) / covered)[:, np.newaxis]
+        strip[lit] = color_sum[start:start + rows].reshape(-1, 3)[lit] * shade + 0.5
+    return frame
+
+# ============================================================================
+# ODE INTEGRATION ENGINE
+# ============================================================================
+
+def lorenz_field(x, y, z, sigma, beta, rho):
+    """Lorenz system."""
+    return sigma * (y - x), x * (rho - z) - y, x * y - beta * z
+
+def rossler_field(x, y, z, a, b, c):
+    """Rössler system."""
+    return -y - z, x + a * y, b + z * (x - c)
+
+def thomas_field(x, y, z, b):
+    """Thomas' cyclically symmetric system."""
+    return np.sin(y) - b * x, np.sin(z) - b * y, np.sin(x) - b * z
+
+def aizawa_field(x, y, z, a, b, c, d, e, f):
+    """Aizawa system."""
+    return ((z - b) * x - d * y,
+            d * x + (z - b) * y,
+            c + a * z - (z**3)/3 - (x**2 + y**2) * (1 + e * z) + f * z * (x**3))
+
+def dadras_field(x, y, z, a, b, c, d, e):
+    """Dadras system."""
+    return y - a * x + b * y * z, c * y - x * z + z, d * x * y - e * z
+
+def chen_field(x, y, z, a, b, c):
+    """Chen-Lee system."""
+    return a * x - y * z, b * y + x * z, c * z + x * y / 3
+
+def halvorsen_field(x, y, z, a):
+    """Halvorsen system."""
+    return (-a * x - 4 * y - 4 * z - y**2,
+            -a * y - 4 * z - 4 * x - z**2,
+            -a * z - 4 * x - 4 * y - x**2)
+
+def four_wing_field(x, y, z, a, b, c):
+    """Four Wing system."""
+    return a * x + y * z, b * x + c * y - x * z, -z - x * y
+
+def rk4_step(field, state, dt, slope=None, **params):
+    """One classical fourth-order Runge-Kutta step; slope may pass in field(state)."""
+    k1 = field(*state, **params) if slope is None else slope
+    k2 = field(*[s + 0.5 * dt * k for s, k in zip(state, k1)], **params)
+    k3 = field(*[s + 0.5 * dt * k for s, k in zip(state, k2)], **params)
+    k4 = field(*[s + dt * k for s, k in zip(state, k3)], **params)
+    return tuple(s + dt / 6 * (a + 2 * b + 2 * c + d)
+                 for s, a, b, c, d in zip(state, k1, k2, k3, k4))
+
+# Dormand-Prince 5(4) tableau: stage rows, then the 5th-minus-4th order error weights
+DOPRI5_STAGES = (
+    (1/5,),
+    (3/40, 9/40),
+    (44/45, -56/15, 32/9),
+    (19372/6561, -25360/2187, 64448/6561, -212/729),
+    (9017/3168, -355/33, 46732/5247, 49/176, -5103/18656),
+    (35/384, 0, 500/1113, 125/192, -2187/6784, 11/84),
+)
+DOPRI5_ERROR = (71/57600, 0, -71/16695, 71/1920, -17253/339200, 22/525, -1/40)
+
+def dopri5_step(field, state, dt, slope=None, **params):
+    """
+    One Dormand-Prince step. Returns (new_state, new_slope, error) where
+    error is the component-wise local error estimate of the step.
+    """
+    ((a21,), (a31, a32), (a41, a42, a43), (a51, a52, a53, a54),
+     (a61, a62, a63, a64, a65), (b1, _, b3, b4, b5, b6)) = DOPRI5_STAGES
+    e1, _, e3, e4, e5, e6, e7 = DOPRI5_ERROR
+    k1 = field(*state, **params) if slope is None else slope
+    k2 = field(*[s + dt * a21 * a for s, a in zip(state, k1)], **params)
+    k3 = field(*[s + dt * (a31 * a + a32 * b) for s, a, b in zip(state, k1, k2)], **params)
+    k4 = field(*[s + dt * (a41 * a + a42 * b + a43 * c)
+                 for s, a, b, c in zip(state, k1, k2, k3)], **params)
+    k5 = field(*[s + dt * (a51 * a + a52 * b + a53 * c + a54 * d)
+                 for s, a, b, c, d in zip(state, k1, k2, k3, k4)], **params)
+    k6 = field(*[s + dt * (a61 * a + a62 * b + a63 * c + a64 * d + a65 * e)
+                 for s, a, b, c, d, e in zip(state, k1, k2, k3, k4, k5)], **params)
+    new_state = tuple(s + dt * (b1 * a + b3 * c + b4 * d + b5 * e + b6 * f)
+                      for s, a, c, d, e, f in zip(state, k1, k3, k4, k5, k6))
+    # The last stage is evaluated at the 5th-order solution, so it doubles as
+    # the slope there (first-same-as-last)
+    k7 = field(*new_state, **params)
+    error = tuple(dt * (e1 * a + e3 * c + e4 * d + e5 * e + e6 * f + e7 * g)
+                  for a, c, d, e, f, g in zip(k1, k3, k4, k5, k6, k7))
+    return new_state, k7, error
+
+def _ode_steps(field, state, dt, method, rtol, atol, params):
+    """Yields (step, state, slope) forever, starting with (0, initial state, slope)."""
+    if method not in ("rk4", "rk45"):
+        raise ValueError(f"Unknown method {method!r}; use 'rk4' or 'rk45'")
+    slope = field(*state, **params)
+    yield 0.0, state, slope
+
+    if method == "rk4":
+        while True:
+            state = rk4_step(field, state, dt, slope, **params)
+            slope = field(*state, **params)
+            yield dt, state, slope
+
+    # An ensemble gives up on the trajectories that force the step far below
+    # dt; a single trajectory only fails once the step underflows
+    ensemble = np.ndim(state[0]) > 0
+    step, min_step = dt, dt * (1e-3 if ensemble else 1e-9)
+    previous_norm, rejected = 1e-4, False
+    while True:
+        new_state, new_slope, error = dopri5_step(field, state, step, slope, **params)
+        if ensemble:
+            # Error norm per trajectory; the ensemble is judged by its finite
+            # trajectories only, so one that blows up is dropped by the
+            # caller instead of stalling the rest
+            scale = atol + rtol * np.maximum(np.abs(state), np.abs(new_state))
+            norms = np.max(np.abs(error) / scale, axis=0)
+            finite = np.isfinite(norms)
+            norm = float(np.max(norms[finite])) if finite.any() else np.inf
+        else:
+            # Plain floats: numpy calls on three scalars would cost more than the step
+            ratios = [abs(e) / (atol + rtol * max(abs(s), abs(n)))
+                      for s, n, e in zip(state, new_state, error)]
+            norm = max(ratios) if math.isfinite(sum(ratios)) else math.inf
+
+        # Hairer's PI controller for DOPRI5: the previous error damps the
+        # step-size oscillation a plain controller gets into, and a step
+        # never grows straight after a rejection
+        if norm <= 1.0:
+            state, slope = new_state, new_slope
+            yield step, state, slope
+            growth = 0.9 * norm ** -0.17 * previous_norm ** 0.04 if norm > 0 else 10.0
+            step *= min(1.0 if rejected else 10.0, max(0.2, growth))
+            previous_norm, rejected = max(norm, 1e-4), False
+        else:
+            step *= max(0.2, 0.9 * norm ** -0.17)
+            rejected = True
+        if step < min_step:
+            failing = ~(norms <= 1.0) if ensemble else None
+            if not ensemble or failing.all():
+                raise ValueError(f"{field.__name__} is too stiff to integrate; "
+                                 "step size underflowed")
+            # Trajectories heading for a singularity: give them up and go on
+            state = tuple(np.where(failing, np.nan, s) for s in state)
+            slope = tuple(np.where(failing, np.nan, k) for k in slope)
+            step = dt
+
+def integrate_ode_blocks(field, initial_state, duration, dt, method="rk4", burn_in=0.0,
+                         rtol=1e-3, atol=1e-6, block_steps=65536, **params):
+    """
+    Integrates a vector field and yields the trajectory in (times, states, slopes) blocks.
+
+    method="rk4" takes fixed steps of dt; method="rk45" starts from dt and
+    adapts the Dormand-Prince step to keep the local error within rtol/atol.
+    The default tolerances are about what a screen image can show; the
+    Hermite interpolation in resample_arc_length keeps the long steps they
+    allow smooth.
+    The first burn_in time units are discarded so the trajectory starts on
+    the attractor. slopes holds field(state) at every step, which
+    resample_arc_length uses for Hermite interpolation. Each block starts
+    with the last step of the one before, so no segment falls between blocks.
+    """
+    elapsed, times, states, slopes = -burn_in, [], [], []
+    for step, state, slope in _ode_steps(field, tuple(initial_state), dt, method,
+                                         rtol, atol, params):
+        elapsed += step
+        if elapsed < 0:
+            continue
+        times.append(elapsed)
+        states.append(state)
+        slopes.append(slope)
+
+        done = elapsed >= duration
+        if done or len(times) > block_steps:
+            block = np.array(times), np.array(states), np.array(slopes)
+            if not np.isfinite(block[1]).all():
+                raise ValueError(f"{field.__name__} diverged; try a smaller dt or method='rk45'")
+            yield block
+            if done:
+                return
+            times, states, slopes = times[-1:], states[-1:], slopes[-1:]
+
+def resample_arc_length(blocks, num_points, duration, axes=(0, 1), image_size=(1, 1),
+                        pilot_steps=1 << 18):
+    """
+    Samples the projection of a trajectory onto two state axes at num_points
+    positions evenly spaced along its length on screen, using cubic Hermite
+    interpolation between integrator steps, and yields them as (xs, ys) blocks.
+
+    The bounding box and total length are measured on the first pilot_steps
+    steps. A longer trajectory has its length extrapolated from the pilot's
+    time span, so it may end a few points short of num_points.
+    """
+    axes = list(axes)
+    blocks = iter(blocks)
+    pilot, steps = [], 0
+    for block in blocks:
+        pilot.append(block)
+        steps += block[0].size
+        if steps >= pilot_steps:
+            complete = False
+            break
+    else:
+        complete = True
+
+    # Measure length in pixels, so both axes count the way they are drawn
+    low = np.min([states[:, axes].min(axis=0) for _, states, _ in pilot], axis=0)
+    high = np.max([states[:, axes].max(axis=0) for _, states, _ in pilot], axis=0)
+    pixels_per_unit = np.asarray(image_size) / np.where(high > low, high - low, 1e-6)
+
+    def chord_lengths(points):
+        return np.hypot(*(np.diff(points, axis=0) * pixels_per_unit).T)
+
+    length = sum(chord_lengths(states[:, axes]).sum() for _, states, _ in pilot)
+    if not complete:
+        length *= duration / (pilot[-1][0][-1] - pilot[0][0][0])
+    spacing = length / max(num_points - 1, 1)
+
+    produced, arc_start = 0, 0.0
+    for times, states, slopes in itertools.chain(pilot, blocks):
+        if times.size < 2:
+            continue
+        points, tangents = states[:, axes], slopes[:, axes]
+        chords = chord_lengths(points)
+        arc = arc_start + np.concatenate(([0.0], np.cumsum(chords)))
+        arc_start = arc[-1]
+
+        # The slack keeps rounding from losing the sample at the very end
+        stop = min(num_points, int(arc[-1] / spacing * (1 + 1e-9)) + 1) if spacing else num_points
+        targets = np.minimum(np.arange(produced, stop) * spacing, arc[-1])
+        produced = max(produced, stop)
+        if targets.size == 0:
+            continue
+
+        segment = np.clip(np.searchsorted(arc, targets, side="right") - 1, 0, chords.size - 1)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            t = np.nan_to_num((targets - arc[segment]) / chords[segment])
+        t = np.clip(t, 0.0, 1.0)[:, None]
+        h = (times[segment + 1] - times[segment])[:, None]
+
+        t2, t3 = t * t, t * t * t
+        resampled = ((2 * t3 - 3 * t2 + 1) * points[segment]
+                     + (t3 - 2 * t2 + t) * h * tangents[segment]
+                     + (3 * t2 - 2 * t3) * points[segment + 1]
+                     + (t3 - t2) * h * tangents[segment + 1])
+        yield resampled[:, 0], resampled[:, 1]
+        if produced >= num_points:
+            return
+
+def integrate_ensemble(field, num_points, num_trajectories=1000, initial_state=(1.0, 1.0, 1.0),
+                       seed=0, dt=0.01, method="rk4", burn_in=0.0, axes=(0, 1),
+                       pilot_steps=1 << 14, block_size=1000000, rtol=1e-3, atol=1e-6, **params):
+    """
+    Integrates many initial conditions in lockstep and yields (xs, ys) blocks.
+
+    The trajectories start from states picked at random along a pilot
+    trajectory of pilot_steps steps, begun at initial_state after burn_in,
+    so every one of them is already on the attractor and the ensemble
+    covers it from the first step. They advance together as one array per
+    state component, so each step is a handful of array operations, and
+    every step contributes one projected point per trajectory until
+    num_points have been produced. Trajectories that blow up are dropped.
+    """
+    pilot = integrate_ode_blocks(field, initial_state, np.inf, dt, method, burn_in,
+                                 rtol, atol, block_steps=pilot_steps, **params)
+    states = next(pilot)[1]
+    rng = np.random.default_rng(seed)
+    starts = rng.choice(len(states), num_trajectories, replace=num_trajectories > len(states))
+    state = tuple(states[starts].T)
+
+    produced, xs, ys = 0, [], []
+    with np.errstate(over="ignore", invalid="ignore"):
+        for _, state, _ in _ode_steps(field, state, dt, method, rtol, atol, params):
+            x, y = state[axes[0]], state[axes[1]]
+            finite = np.isfinite(x) & np.isfinite(y)
+            if not finite.any():
+                raise ValueError(f"Every trajectory of {field.__name__} diverged; "
+                                 "try a smaller dt")
+            wanted = num_points - produced
+            xs.append(x[finite][:wanted])
+            ys.append(y[finite][:wanted])
+            produced += xs[-1].size
+
+            if produced >= num_points or sum(block.size for block in xs) >= block_size:
+                yield np.concatenate(xs), np.concatenate(ys)
+                xs, ys = [], []
+                if produced >= num_points:
+                    return
+
+def trace_attractor(field, num_points, image_size, axes, duration, dt, method="rk4",
+                    rtol=1e-3, atol=1e-6, burn_in=0.0, initial_state=(1.0, 1.0, 1.0),
+                    num_trajectories=1, **params):
+    """
+    Integrates field and yields num_points evenly spaced points of its
+    projection as (xs, ys) blocks for render_point_blocks.
+
+    With num_trajectories > 1 the points come from an ensemble integrated in
+    lockstep instead, seeded along a short pilot trajectory and each
+    trajectory running num_points / num_trajectories steps, so duration does
+    not apply.
+    """
+    if num_trajectories > 1:
+        return integrate_ensemble(field, num_points, num_trajectories, initial_state, dt=dt,
+                                  method=method, burn_in=burn_in, axes=axes, rtol=rtol,
+                                  atol=atol, **params)
+    trajectory = integrate_ode_blocks(field, initial_state, duration, dt, method, burn_in,
+                                      rtol, atol, **params)
+    return resample_arc_length(trajectory, num_points, duration, axes, image_size)
+
+# ============================================================================
+# ESCAPE-TIME ENGINE
+# ============================================================================
+
+def _square_plus(re, im, c):
+    """(re + i*im)^2 + c, spelled out so it rounds exactly like Python's complex."""
+    z = np.empty(c.shape, dtype=np.complex128)
+    z.real = re * re - im * im + c.real
+    z.imag = re * im + im * re + c.imag
+    return z
+
+def mandelbrot_rule(z, c):
+    """Quadratic iteration z -> z^2 + c (Mandelbrot and Julia sets)."""
+    return _square_plus(z.real, z.imag, c)
+
+def tricorn_rule(z, c):
+    """Conjugated iteration z -> conj(z)^2 + c (Tricorn)."""
+    return _square_plus(z.real, -z.imag, c)
+
+def burning_ship_rule(z, c):
+    """Abs-folded iteration z -> (|Re z| + i|Im z|)^2 + c (Burning Ship)."""
+    return _square_plus(np.abs(z.real), np.abs(z.imag), c)
+
+def complex_grid(image_size, x_min, x_max, y_min, y_max, row_start=0, row_stop=None):
+    """Complex plane coordinates of every pixel, one row per image line."""
+    width, height = image_size
+    if row_stop is None:
+        row_stop = height
+    xs = x_min + (np.arange(width) / width) * (x_max - x_min)
+    ys = y_min + (np.arange(row_start, row_stop) / height) * (y_max - y_min)
+    grid = np.empty((row_stop - row_start, width), dtype=np.complex128)
+    grid.real = xs[np.newaxis, :]
+    grid.imag = ys[:, np.newaxis]
+    return grid
+
+# Escape radius for smooth coloring; the fractional count is only accurate
+# once |z| is far beyond 2
+SMOOTH_BAILOUT = 256.0
+
+def mandelbrot_interior(c):
+    """
+    True where c lies in the main cardioid or the period-2 bulb of the
+    Mandelbrot set, the regions that hold most interior pixels.
+    """
+    x, y = c.real, c.imag
+    y2 = y * y
+    q = (x - 0.25) ** 2 + y2
+    return (q * (q + (x - 0.25)) <= 0.25 * y2) | ((x + 1) ** 2 + y2 <= 0.0625)
+
+def escape_time(z0, c, rule=mandelbrot_rule, max_iter=100, bailout=2.0, return_modulus=False,
+                interior=None, cycle_tolerance=1e-13):
+    """
+    Iterates z -> rule(z, c) over whole arrays at once.
+
+    Returns the number of steps taken before |z| exceeded bailout, or
+    max_iter for points that never escaped. Escaped points are dropped from
+    the working arrays so later iterations only touch live pixels. With
+    return_modulus the |z| each point escaped with is returned as well
+    (NaN for points that never escaped), for smooth coloring.
+
+    Points flagged in the interior mask are never iterated. The others are
+    compared with the value they had at the last power-of-two step (Brent's
+    cycle detection); an orbit that comes back within cycle_tolerance is
+    periodic, will never escape and is dropped too. None disables the check.
+    """
+    z0, c = np.broadcast_arrays(np.asarray(z0, dtype=np.complex128),
+                                np.asarray(c, dtype=np.complex128))
+    counts = np.full(z0.size, max_iter, dtype=np.int32)
+    active = np.arange(z0.size)
+    z = z0.ravel().copy()
+    c = c.ravel().copy()
+    modulus = np.full(z0.size, np.nan) if return_modulus else None
+    if interior is not None:
+        outside = ~np.broadcast_to(interior, z0.shape).ravel()
+        active, z, c = active[outside], z[outside], c[outside]
+    saved = z
+
+    for n in range(max_iter):
+        if active.size == 0:
+            break
+        magnitude = np.abs(z)
+        escaped = magnitude > bailout
+        finished = escaped
+        if cycle_tolerance is not None and n > 0:
+            finished = escaped | (np.abs(z - saved) < cycle_tolerance)
+        if finished.any():
+            counts[active[escaped]] = n
+            if return_modulus:
+                modulus[active[escaped]] = magnitude[escaped]
+            alive = ~finished
+            active, z, c, saved = active[alive], z[alive], c[alive], saved[alive]
+        if n & (n - 1) == 0:
+            saved = z
+        z = rule(z, c)
+
+    if return_modulus:
+        return counts.reshape(z0.shape), modulus.reshape(z0.shape)
+    return counts.reshape(z0.shape)
+
+def smooth_escape_counts(counts, modulus):
+    """
+    Fractional iteration counts n + 1 - log2(log|z_n|) of escaped points.
+
+    For quadratic rules this removes the steps between integer counts, as
+    long as the bailout was large enough (SMOOTH_BAILOUT) for |z_n| to sit in
+    the asymptotic regime.
+    """
+    with np.errstate(divide="ignore", invalid="ignore"):
+        return counts + 1 - np.log2(np.log(modulus))
+
+def color_escape_counts(counts, max_iter, colorize, modulus=None, count_range=None):
+    """
+    Map escape counts to RGB, painting points that never escaped black.
+
+    Integer counts are colored through a max_iter + 1 entry table. Given the
+    escape modulus, the fractional counts are colored instead, which removes
+    the bands between neighbouring integer counts. count_range (low, high)
+    stretches the palette over those counts instead of 0 .. max_iter.
+    """
+    colorize = as_colorizer(colorize)
+    low, high = (0, max_iter) if count_range is None else count_range
+    span = max(high - low, 1e-9)
+    if modulus is None:
+        table = colorize(np.clip((np.arange(max_iter + 1) - low) / span, 0.0, 1.0))
+        table[max_iter] = 0
+        return table[counts]
+
+    ratio = np.clip((smooth_escape_counts(counts, modulus) - low) / span, 0.0, 1.0)
+    rgb = colorize(np.nan_to_num(ratio))
+    rgb[counts >= max_iter] = 0
+    return rgb
+
+def _rectangle_border(y0, y1, x0, x1, width):
+    """Flat indices of the edge pixels of the inclusive rectangle [y0, y1] x [x0, x1]."""
+    columns = np.arange(x0, x1 + 1)
+    rows = np.arange(y0 + 1, y1)
+    return np.concatenate([y0 * width + columns, y1 * width + columns,
+                           rows * width + x0, rows * width + x1])
+
+def subdivide_escape_time(evaluate, shape, max_iter, smooth=False, min_size=8):
+    """
+    Mariani-Silver rendering: iteration counts computed only where they vary.
+
+    evaluate(flat_indices) returns (counts, modulus) for those pixels of the
+    shape-sized grid. Starting from the whole grid, the border of every
+    rectangle is evaluated; a rectangle whose border has a single count is
+    filled with it, any other is cut into quarters along its midlines, down
+    to min_size pixels where the remaining pixels are evaluated directly.
+    Each level is evaluated in one batch. Filled pixels have no escape
+    modulus, so with smooth the filled exterior pixels are evaluated at the
+    end; only the filled interior is saved there. Returns (counts, modulus)
+    arrays of the given shape.
+    """
+    height, width = shape
+    counts = np.full(shape, -1, dtype=np.int32)
+    modulus = np.full(shape, np.nan)
+    pending = np.zeros(height * width, dtype=bool)
+
+    def fill(flat):
+        pending[flat] = True
+        np.logical_and(pending, counts.ravel() < 0, out=pending)
+        flat = np.flatnonzero(pending)
+        pending[flat] = False
+        if flat.size:
+            counts.flat[flat], modulus.flat[flat] = evaluate(flat)
+
+    def inside(y0, y1, x0, x1):
+        rows = np.arange(y0 + 1, y1)[:, np.newaxis]
+        return (rows * width + np.arange(x0 + 1, x1)).ravel()
+
+    rectangles = [(0, height - 1, 0, width - 1)]
+    while rectangles:
+        borders = [_rectangle_border(*rectangle, width) for rectangle in rectangles]
+        fill(np.concatenate(borders))
+
+        starts = np.cumsum([0] + [border.size for border in borders[:-1]])
+        values = counts.flat[np.concatenate(borders)]
+        lowest = np.minimum.reduceat(values, starts)
+        highest = np.maximum.reduceat(values, starts)
+
+        subdivided, leftovers = [], []
+        for (y0, y1, x0, x1), low, high in zip(rectangles, lowest, highest):
+            if y1 - y0 < 2 or x1 - x0 < 2:
+                continue
+            if low == high:
+                counts[y0 + 1:y1, x0 + 1:x1] = low
+            elif y1 - y0 <= min_size and x1 - x0 <= min_size:
+                leftovers.append(inside(y0, y1, x0, x1))
+            else:
+                ys = (y0, (y0 + y1) // 2, y1) if y1 - y0 > min_size else (y0, y1)
+                xs = (x0, (x0 + x1) // 2, x1) if x1 - x0 > min_size else (x0, x1)
+                subdivided += [(top, bottom, left, right)
+                               for top, bottom in zip(ys, ys[1:])
+                               for left, right in zip(xs, xs[1:])]
+        if leftovers:
+            fill(np.concatenate(leftovers))
+        rectangles = subdivided
+
+    if smooth:
+        flat = np.flatnonzero((counts.ravel() < max_iter) & np.isnan(modulus.ravel()))
+        if flat.size:
+            counts.flat[flat], modulus.flat[flat] = evaluate(flat)
+    return counts, modulus
+
+def escape_time_band(row_start, row_stop, image_size, view, rule, max_iter, colorize,
+                     julia_c=None, smooth=False, subdivide=False):
+    """
+    Renders rows [row_start, row_stop) of an escape-time fractal to RGB.
+
+    view is (x_min, x_max, y_min, y_max). Without julia_c every pixel is a
+    parameter c iterated from z = 0 (Mandelbrot style); with it every pixel is
+    a starting z iterated with that fixed c (Julia style). smooth colors by
+    fractional iteration count instead of banded integer counts, and
+    subdivide skips regions of uniform count (see subdivide_escape_time).
+    """
+    grid = complex_grid(image_size, *view, row_start=row_start, row_stop=row_stop)
+    bailout = SMOOTH_BAILOUT if smooth else 2.0
+
+    def evaluate(points):
+        z0, c = (0, points) if julia_c is None else (points, julia_c)
+        interior = mandelbrot_interior(points) if julia_c is None and rule is mandelbrot_rule \
+            else None
+        return escape_time(z0, c, rule, max_iter, bailout, return_modulus=True, interior=interior)
+
+    if subdivide:
+        counts, modulus = subdivide_escape_time(lambda flat: evaluate(grid.flat[flat]),
+                                                grid.shape, max_iter, smooth)
+    else:
+        counts, modulus = evaluate(grid)
+    return color_escape_counts(counts, max_iter, colorize, modulus if smooth else None)
+
+# ============================================================================
+# DEEP ZOOM (PERTURBATION) ENGINE
+# ============================================================================
+
+def zoom_precision(scale, guard_digits=20):
+    """Significant decimal digits needed to resolve pixels of a view scale wide."""
+    return max(30, guard_digits - Decimal(str(scale)).adjusted())
+
+@lru_cache(maxsize=8)
+def reference_orbit(center, max_iter, bailout=2.0, digits=30):
+    """
+    Mandelbrot orbit of the point center = (re, im), given as decimal strings.
+
+    The orbit is iterated with `digits` significant digits and stored as
+    complex128 values (they are of order one), from Z_0 = 0 until it escapes
+    bailout or reaches Z_max_iter. The result is cached and read-only.
+    """
+    limit = Decimal(bailout) ** 2
+    with localcontext() as context:
+        context.prec = digits
+        c_re, c_im = Decimal(center[0]), Decimal(center[1])
+        re = im = Decimal(0)
+        orbit = [0j]
+        for _ in range(max_iter):
+            re, im = re * re - im * im + c_re, 2 * re * im + c_im
+            orbit.append(complex(float(re), float(im)))
+            if re * re + im * im > limit:
+                break
+
+    orbit = np.array(orbit)
+    orbit.flags.writeable = False
+    return orbit
+
+def perturbation_escape_time(dc, orbit, max_iter=100, bailout=2.0, return_modulus=False):
+    """
+    Escape counts for c = reference + dc, with every pixel a float64 offset
+    dz from the reference orbit: dz -> (2 Z_m + dz) dz + dc.
+
+    When the full value Z_m + dz gets smaller than dz, or the reference
+    orbit runs out because it escaped, the pixel is rebased: dz becomes the
+    full value and m restarts at 0. That keeps one reference valid for the
+    whole frame. Returns the same as escape_time.
+    """
+    dc = np.asarray(dc, dtype=np.complex128)
+    counts = np.full(dc.size, max_iter, dtype=np.int32)
+    modulus = np.full(dc.size, np.nan) if return_modulus else None
+    active = np.arange(dc.size)
+    delta_c = dc.ravel().copy()
+    dz = np.zeros_like(delta_c)
+    m = np.zeros(dc.size, dtype=np.intp)
+    last = orbit.size - 1
+
+    for n in range(max_iter):
+        if active.size == 0:
+            break
+        z = orbit[m] + dz
+        magnitude = np.abs(z)
+        escaped = magnitude > bailout
+        if escaped.any():
+            counts[active[escaped]] = n
+            if return_modulus:
+                modulus[active[escaped]] = magnitude[escaped]
+            alive = ~escaped
+            active, delta_c, dz, m = active[alive], delta_c[alive], dz[alive], m[alive]
+            z, magnitude = z[alive], magnitude[alive]
+
+        rebase = (magnitude < np.abs(dz)) | (m == last)
+        if rebase.any():
+            dz[rebase] = z[rebase]
+            m[rebase] = 0
+        dz = (2 * orbit[m] + dz) * dz + delta_c
+        m += 1
+
+    if return_modulus:
+        return counts.reshape(dc.shape), modulus.reshape(dc.shape)
+    return counts.reshape(dc.shape)
+
+def zoom_offsets(image_size, scale, row_start=0, row_stop=None):
+    """
+    Offsets dc of every pixel from the view center, for a view scale units
+    wide. Offsets are float64, so the pixel size scale / width must be a
+    normal float64 (about 2.2e-308 or more); deeper views raise ValueError.
+    """
+    width, height = image_size
+    if row_stop is None:
+        row_stop = height
+    pixel = float(Decimal(str(scale))) / width
+    if not np.finfo(np.float64).tiny <= pixel < np.inf:
+        raise ValueError(f"Zoom scale {scale} is out of float64 range; views must be "
+                         f"between about {np.finfo(np.float64).tiny * width:.1e} and 1e308 wide")
+    xs = (np.arange(width) - width / 2) * pixel
+    ys = (np.arange(row_start, row_stop) - height / 2) * pixel
+    offsets = np.empty((row_stop - row_start, width), dtype=np.complex128)
+    offsets.real = xs[np.newaxis, :]
+    offsets.imag = ys[:, np.newaxis]
+    return offsets
+
+def zoom_count_range(center, scale, max_iter, image_size, smooth=True, probe_factor=8,
+                     digits=None):
+    """
+    (low, high) escape counts of a zoom view, measured on a render
+    probe_factor times coarser, so every band stretches the palette alike.
+    """
+    bailout = SMOOTH_BAILOUT if smooth else 2.0
+    orbit = reference_orbit(tuple(center), max_iter, bailout, digits or zoom_precision(scale))
+    width, height = image_size
+    probe = zoom_offsets((max(1, width // probe_factor), max(1, height // probe_factor)), scale)
+    counts, modulus = perturbation_escape_time(probe, orbit, max_iter, bailout,
+                                               return_modulus=True)
+    escaped = counts < max_iter
+    if not escaped.any():
+        return 0, max_iter
+    values = smooth_escape_counts(counts, modulus)[escaped] if smooth else counts[escaped]
+    low, high = np.percentile(values, [1, 99])
+    return float(low), float(high)
+
+def mandelbrot_zoom_band(row_start, row_stop, image_size, center, scale, max_iter, colorize,
+                         smooth=True, count_range=None, digits=None):
+    """
+    Renders rows [row_start, row_stop) of a Mandelbrot view of width scale
+    around center = (re, im) decimal strings, by perturbation. digits
+    overrides the reference orbit precision, so views of several scales can
+    share one orbit.
+    """
+    bailout = SMOOTH_BAILOUT if smooth else 2.0
+    orbit = reference_orbit(tuple(center), max_iter, bailout, digits or zoom_precision(scale))
+    offsets = zoom_offsets(image_size, scale, row_start, row_stop)
+    counts, modulus = perturbation_escape_time(offsets, orbit, max_iter, bailout,
+                                               return_modulus=True)
+    return color_escape_counts(counts, max_iter, colorize, modulus if smooth else None,
+                               count_range)
+
+# ============================================================================
+# NEWTON FRACTAL ENGINE
+# ============================================================================
+
+@lru_cache(maxsize=None)
+def polynomial_roots(coefficients):
+    """Roots of a polynomial (highest power first), sorted by angle and cached per polynomial."""
+    roots = np.roots(coefficients)
+    return roots[np.argsort(np.mod(np.angle(roots), 2 * np.pi), kind="stable")]
+
+def newton_iterate(z0, coefficients, max_iter=50, tolerance=1e-6):
+    """
+    Runs Newton's method on a whole array of starting points.
+
+    Returns (root_index, iterations): the index into polynomial_roots() each
+    point converged to and how many steps it took. A point is frozen as soon
+    as it is within tolerance of a root, so later steps only touch the pixels
+    still moving. Points that never converge get the root they ended closest
+    to and max_iter; points that hit a critical point get root index -1.
+    """
+    coefficients = tuple(coefficients)
+    roots = polynomial_roots(coefficients)
+    derivative = np.polyder(np.asarray(coefficients, dtype=np.complex128))
+
+    z = np.asarray(z0, dtype=np.complex128).ravel().copy()
+    root_index = np.full(z.size, -1, dtype=np.intp)
+    iterations = np.full(z.size, max_iter, dtype=np.int32)
+    active = np.arange(z.size)
+
+    with np.errstate(divide="ignore", invalid="ignore", over="ignore"):
+        for n in range(max_iter + 1):
+            distances = np.abs(z[:, np.newaxis] - roots[np.newaxis, :])
+            nearest = distances.argmin(axis=1)
+            converged = distances[np.arange(z.size), nearest] < tolerance
+            if n == max_iter:
+                converged = np.isfinite(z)
+            if converged.any():
+                root_index[active[converged]] = nearest[converged]
+                iterations[active[converged]] = n
+            alive = ~converged & np.isfinite(z)
+            active, z = active[alive], z[alive]
+            if active.size == 0 or n == max_iter:
+                break
+            z = z - np.polyval(coefficients, z) / np.polyval(derivative, z)
+
+    shape = np.shape(z0)
+    return root_index.reshape(shape), iterations.reshape(shape)
+
+def newton_band(row_start, row_stop, image_size, max_iter, coefficients=(1, 0, 0, -1),
+                tolerance=1e-6, palette="rainbow"):
+    """
+    Renders rows [row_start, row_stop) of a Newton fractal to RGB.
+
+    Each basin gets its own hue (red, green, blue for z^3 - 1) and is shaded
+    by how quickly it converged, so basin boundaries fade to black.
+    """
+    width, height = image_size
+    xs = (np.arange(width) - width/2) / (width/4)
+    ys = (np.arange(row_start, row_stop) - height/2) / (height/4)
+    z0 = xs[np.newaxis, :] + 1j * ys[:, np.newaxis]
+
+    root_index, iterations = newton_iterate(z0, coefficients, max_iter, tolerance)
+
+    num_roots = len(polynomial_roots(tuple(coefficients)))
+    root_colors = np.vstack([as_colorizer(palette)(np.arange(num_roots) / num_roots),
+                             np.zeros((1, 3), dtype=np.uint8)])
+    intensity = 1 - iterations / max_iter
+    return (root_colors[root_index] * intensity[..., np.newaxis]).astype(np.uint8)
+
+# ============================================================================
+# PARALLEL TILE RENDERER
+# ============================================================================
+
+def _render_band_to_shared_memory(render_band, shm_name, shape, rows):
+    """Worker side of render_in_bands: write one band straight into the shared frame."""
+    shm = shared_memory.SharedMemory(name=shm_name)
+    try:
+        frame = np.ndarray(shape, dtype=np.uint8, buffer=shm.buf)
+        frame[rows[0]:rows[1]] = render_band(*rows)
+        del frame
+    finally:
+        shm.close()
+
+def supersampled_band(render_band, supersample, resample, height, row_start, row_stop):
+    """
+    Rows [row_start, row_stop) of an image of the given height, rendered by
+    render_band at supersample times the resolution and downsampled.
+    """
+    # Lanczos reads 3 output pixels to either side, so render that much context
+    context = 0 if resample == "box" else 3 * supersample
+    top = max(0, supersample * row_start - context)
+    bottom = min(supersample * height, supersample * row_stop + context)
+    return downsample(render_band(top, bottom), supersample, resample,
+                      supersample * row_start - top, row_stop - row_start)
+
+def _render_band_to_file(render_band, path, shape, rows):
+    """Worker side of render_in_bands for a memory-mapped frame: write one band into the file."""
+    frame = np.memmap(path, dtype=np.uint8, mode="r+", shape=shape)
+    frame[rows[0]:rows[1]] = render_band(*rows)
+    frame.flush()
+    del frame
+
+def render_in_bands(render_band, image_size, workers=1, supersample=1, resample="lanczos"):
+    """
+    Renders an image as horizontal bands, optionally across worker processes.
+
+    render_band(row_start, row_stop) must return the RGB pixels of those rows
+    and be picklable (a module-level function or a partial of one). With
+    workers > 1 the bands are farmed out to a process pool and each worker
+    writes its rows directly into a shared-memory framebuffer, so no pixel
+    data is pickled. Bands are small and handed out in order so the pool
+    stays balanced even when some rows are much more expensive than others.
+    A frame too big for RAM (see allocate_buffer) is a memory-mapped file
+    that the workers write their bands into instead.
+
+    With supersample=k, render_band must render an image k times larger than
+    image_size; each band is rendered at that size (with a few rows of
+    context) and downsampled before it is stored, so the full-size
+    supersampled image never exists.
+    """
+    width, height = image_size
+    if supersample > 1:
+        render_band = partial(supersampled_band, render_band, supersample, resample, height)
+    shape = (height, width, 3)
+    # Several bands per worker for load balancing.
+    band_height = max(16, -(-height // (max(1, workers) * 8)))
+    band_height = min(band_height, max(16, strip_rows(width * supersample ** 2)))
+    bands = [(start, min(start + band_height, height)) for start in range(0, height, band_height)]
+
+    if workers <= 1:
+        frame = allocate_buffer(shape, np.uint8)
+        for row_start, row_stop in bands:
+            frame[row_start:row_stop] = render_band(row_start, row_stop)
+        return frame
+
+    frame = allocate_buffer(shape, np.uint8)
+    if isinstance(frame, np.memmap):
+        frame.flush()
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            jobs = [pool.submit(_render_band_to_file, render_band, frame.filename, shape, rows)
+                    for rows in bands]
+            for job in jobs:
+                job.result()
+        return frame
+    del frame
+
+    shm = shared_memory.SharedMemory(create=True, size=height * width * 3)
+    try:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            jobs = [pool.submit(_render_band_to_shared_memory, render_band, shm.name, shape, rows)
+                    for rows in bands]
+            for job in jobs:
+                job.result()
+        frame = np.ndarray(shape, dtype=np.uint8, buffer=shm.buf).copy()
+    finally:
+        shm.close()
+        shm.unlink()
+    return frame
+
+# ============================================================================
+# ANIMATION PIPELINE
+# ============================================================================
+
+VIDEO_EXTENSIONS = (".mp4", ".mkv", ".mov", ".webm")
+
+def frame_position(index, num_frames, ease=True):
+    """Position 0 .. 1 of a frame in its sequence, smoothstepped so sweeps start and stop gently."""
+    t = index / max(1, num_frames - 1)
+    return t * t * (3 - 2 * t) if ease else t
+
+def julia_drift_frame(index, num_frames, image_size, c_start, c_stop, max_iter=200,
+                      view=(-2.0, 2.0, -2.0, 2.0), palette="navy_cyan", smooth=True,
+                      subdivide=False):
+    """One frame of a Julia set whose c moves in a straight line from c_start to c_stop."""
+    t = frame_position(index, num_frames)
+    julia_c = complex(c_start) + (complex(c_stop) - complex(c_start)) * t
+    return escape_time_band(0, image_size[1], image_size, view, mandelbrot_rule, max_iter,
+                            palette, julia_c=julia_c, smooth=smooth, subdivide=subdivide)
+
+def clifford_morph_frame(index, num_frames, image_size, start, stop, num_points=300000,
+                         render_mode="density", palette="cyan_magenta"):
+    """One frame of a Clifford attractor with (a, b, c, d) blended from start to stop."""
+    t = frame_position(index, num_frames)
+    a, b, c, d = (p + (q - p) * t for p, q in zip(start, stop))
+    blocks = iterate_map_blocks(clifford_step, num_points, a=a, b=b, c=c, d=d)
+    return render_point_blocks(blocks, num_points, image_size, palette, render_mode)
+
+def mandelbrot_zoom_frame(index, num_frames, image_size, center, scale_start, scale_stop,
+                          max_iter=2000, palette="deep_blue", smooth=True):
+    """
+    One frame of a zoom from scale_start to scale_stop at a constant rate.
+
+    Every frame iterates the reference orbit at the precision of the deepest
+    frame, so a worker computes it once and reuses it for all its frames.
+    """
+    t = Decimal(frame_position(index, num_frames, ease=False))
+    start, stop = Decimal(str(scale_start)), Decimal(str(scale_stop))
+    digits = zoom_precision(min(start, stop))
+    with localcontext() as context:
+        context.prec = digits
+        scale = str(start * (stop / start) ** t)
+    count_range = zoom_count_range(center, scale, max_iter, image_size, smooth, digits=digits)
+    return mandelbrot_zoom_band(0, image_size[1], image_size, tuple(center), scale, max_iter,
+                                palette, smooth, count_range, digits)
+
+def open_frame_sink(output, image_size, fps=30):
+    """
+    Returns write(index, frame) and close() functions for a frame sequence.
+
+    An output ending in a video extension is streamed as raw RGB into an
+    ffmpeg process that encodes H.264; anything else is a file name pattern
+    such as "frames/julia_{:04d}.png" that each frame index is formatted into.
+    """
+    width, height = image_size
+    if output.lower().endswith(VIDEO_EXTENSIONS):
+        ffmpeg = shutil.which("ffmpeg")
+        if ffmpeg is None:
+            raise RuntimeError(f"ffmpeg is needed to write {output}; install it or write "
+                               "numbered frames instead")
+        process = subprocess.Popen(
+            [ffmpeg, "-y", "-loglevel", "error", "-f", "rawvideo", "-pix_fmt", "rgb24",
+             "-s", f"{width}x{height}", "-r", str(fps), "-i", "-",
+             "-c:v", "libx264", "-pix_fmt", "yuv420p", output],
+            stdin=subprocess.PIPE)
+
+        def write(index, frame):
+            try:
+                process.stdin.write(np.ascontiguousarray(frame).data)
+            except OSError as error:
+                try:
+                    process.stdin.close()
+                except OSError:
+                    pass
+                raise RuntimeError(f"ffmpeg exited with status {process.wait()} at frame "
+                                   f"{index} of {output}") from error
+
+        def close():
+            if process.returncode is not None:
+                return  # write has already reported ffmpeg's exit
+            try:
+                process.stdin.close()
+            except BrokenPipeError:
+                pass  # ffmpeg exited early; its status is checked below
+            status = process.wait()
+            if status != 0:
+                raise RuntimeError(f"ffmpeg failed to encode {output} (exit status {status})")
+        return write, close
+
+    if output.format(0) == output:
+        raise ValueError(f"Frame pattern {output!r} needs a field for the frame number, "
+                         "e.g. frames/julia_{:04d}.png")
+    directory = os.path.dirname(output.format(0))
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+
+    def write(index, frame):
+        save_image(Image.fromarray(frame, "RGB"), output.format(index))
+    return write, lambda: None
+
+def _render_frame_to_shared_memory(render_frame, shm_name, shape, index):
+    """Worker side of render_animation: render one frame into its slot of the ring."""
+    shm = shared_memory.SharedMemory(name=shm_name)
+    try:
+        frames = np.ndarray(shape, dtype=np.uint8, buffer=shm.buf)
+        frames[index % shape[0]] = render_frame(index)
+        del frames
+    finally:
+        shm.close()
+
+def render_animation(render_frame, num_frames, image_size, output, workers=1, fps=30):
+    """
+    Renders frames 0 .. num_frames - 1 and writes them out in order.
+
+    render_frame(index) must return the RGB pixels of a frame and be
+    picklable. With workers > 1 whole frames are rendered in parallel into a
+    ring of 2 * workers shared-memory framebuffers, which are written out and
+    reused as soon as the frames before them are done; the worker processes
+    live for the whole sequence, so cached palette tables and reference
+    orbits are computed once per worker rather than once per frame.
+    """
+    write, close = open_frame_sink(output, image_size, fps)
+    try:
+        if workers <= 1:
+            for index in range(num_frames):
+                write(index, render_frame(index))
+                print(f"Frame {index + 1}/{num_frames}", end="\r")
+        else:
+            width, height = image_size
+            shape = (2 * workers, height, width, 3)
+            shm = shared_memory.SharedMemory(create=True, size=int(np.prod(shape)))
+            try:
+                frames = np.ndarray(shape, dtype=np.uint8, buffer=shm.buf)
+                pending = collections.deque()
+
+                def write_oldest():
+                    index, job = pending.popleft()
+                    job.result()
+                    write(index, frames[index % shape[0]])
+                    print(f"Frame {index + 1}/{num_frames}", end="\r")
+
+                with ProcessPoolExecutor(max_workers=workers) as pool:
+                    for index in range(num_frames):
+                        if len(pending) == shape[0]:
+                            write_oldest()
+                        pending.append((index, pool.submit(_render_frame_to_shared_memory,
+                                                           render_frame, shm.name, shape, index)))
+                    while pending:
+                        write_oldest()
+                del frames
+            finally:
+                shm.close()
+                shm.unlink()
+    finally:
+        close()
+    print(f"Animation saved as {output}")
+
+def animate_julia_drift(output="animations/julia_drift_{:04d}.png", num_frames=600,
+                        image_size=(1920, 1080), workers=1, fps=30,
+                        c_start=-0.8 + 0.156j, c_stop=-0.7 + 0.27015j, max_iter=200,
+                        palette="navy_cyan"):
+    """Julia set with c drifting between two values."""
+    frame = partial(julia_drift_frame, num_frames=num_frames, image_size=image_size,
+                    c_start=c_start, c_stop=c_stop, max_iter=max_iter, palette=palette)
+    render_animation(frame, num_frames, image_size, output, workers, fps)
+
+def animate_clifford_morph(output="animations/clifford_morph_{:04d}.png", num_frames=600,
+                           image_size=(1920, 1080), workers=1, fps=30,
+                           start=(-1.4, 1.6, 1.0, 0.7), stop=(-1.6, 1.6, 0.7, 1.0),
+                           num_points=2000000, palette="cyan_magenta"):
+    """Clifford attractor morphing between two parameter sets."""
+    frame = partial(clifford_morph_frame, num_frames=num_frames, image_size=image_size,
+                    start=start, stop=stop, num_points=num_points, palette=palette)
+    render_animation(frame, num_frames, image_size, output, workers, fps)
+
+def animate_mandelbrot_zoom(output="animations/mandelbrot_zoom_{:04d}.png", num_frames=600,
+                            image_size=(1920, 1080), workers=1, fps=30,
+                            center=("-0.743643887037158704752191506114774",
+                                    "0.131825904205311970493132056385139"),
+                            scale_start="3.5", scale_stop="1e-9", max_iter=2000,
+                            palette="deep_blue"):
+    """Mandelbrot zoom-in towards center at a constant rate."""
+    frame = partial(mandelbrot_zoom_frame, num_frames=num_frames, image_size=image_size,
+                    center=tuple(center), scale_start=scale_start, scale_stop=scale_stop,
+                    max_iter=max_iter, palette=palette)
+    render_animation(frame, num_frames, image_size, output, workers, fps)
+
 # ============================================================================
 # ORIGINAL WALLPAPER GENERATORS (From your old script)
 # ============================================================================
 
+def random_art_colors(x, y, brightness_factor=1.5):
+    """RGB of the sine-cosine art at arrays of coordinates in [-1, 1]."""
+    r = np.clip(np.abs(random_function(x, y)) / 2 * 255 * brightness_factor, 0, 255).astype(np.uint8)
+    g = np.clip(np.abs(random_function2(x, y)) / 2 * 255 * brightness_factor, 0, 255).astype(np.uint8)
+    b = ((r.astype(np.uint16) + g) // 2).astype(np.uint8)
+    return np.stack(np.broadcast_arrays(r, g, b), axis=-1)
+
 def generate_random_math_art(image_size=(3840, 2160), num_points=300000,
                             output_file="wallpapers/random_math_art.png",
-                            dpi=(1000, 1000), brightness_factor=1.5, add_signature=False):
+                            dpi=(1000, 1000), brightness_factor=1.5, add_signature=False,
+                            seed=0, full_coverage=False, preview=False):
     """Generates random mathematical art using sine-cosine functions."""
     width, height = image_size
-    img = Image.new("RGB", image_size, "black")
-    draw = ImageDraw.Draw(img)
-    
-    for _ in range(num_points):
-        x = random.uniform(-1, 1)
-        y = random.uniform(-1, 1)
-        
-        px = int((x + 1) / 2 * width)
-        py = int((y + 1) / 2 * height)
-        
-        r_raw = abs(random_function(x, y))
-        g_raw = abs(random_function2(x, y))
-        
-        r = int(np.clip(r_raw / 2 * 255 * brightness_factor, 0, 255))
-        g = int(np.clip(g_raw / 2 * 255 * brightness_factor, 0, 255))
-        b = int(np.clip((r + g) / 2, 0, 255))
-        
-        draw.point((px, py), fill=(r, g, b))
-
-    if add_signature:
-        add_signature_to_image(draw, image_size)
-
-    img.save(output_file, dpi=dpi)
-    img.show()
-    print(f"Random Math Art saved as {output_file}")
+    if full_coverage:
+        # Every pixel, sampled at its center
+        x = (np.arange(width) + 0.5) / width * 2 - 1
+        y = (np.arange(height) + 0.5) / height * 2 - 1
+        frame = random_art_colors(x[np.newaxis, :], y[:, np.newaxis], brightness_factor)
+    else:
+        rng = np.random.default_rng(seed)
+        frame = np.zeros((height, width, 3), dtype=np.uint8)
+        for start in range(0, num_points, 1 << 20):
+            x, y = rng.uniform(-1, 1, size=(2, min(1 << 20, num_points - start)))
+            px = ((x + 1) / 2 * width).astype(np.intp)
+            py = ((y + 1) / 2 * height).astype(np.intp)
+            scatter_last(frame, py * width + px, random_art_colors(x, y, brightness_factor))
+
+    finish_wallpaper(frame, output_file, dpi, add_signature, preview, "Random Math Art")
 
 def generate_dejong_attractor(image_size=(3840, 2160), num_points=300000,
                              output_file="D:/Cool Automation Scripts/My Wallpapers/dejong_attractor.png",
-                             dpi=(1000, 1000), add_signature=False):
+                             dpi=(1000, 1000), add_signature=False,
+                             render_mode="points", num_orbits=1000,
+                             supersample=1, resample="lanczos",
+                             palette="purple_white", preview=False):
     """Generates de Jong attractor with beautiful gradient."""
-    width, height = image_size
-    img = Image.new("RGB", image_size, "black")
-    draw = ImageDraw.Draw(img)
-    
-    a, b, c, d = 2.01, -2.53, 1.61, -0.33
-    x, y = 0.0, 0.0
-    
-    for _ in range(100):
-        x, y = np.sin(a * y) - np.cos(b * x), np.sin(c * x) - np.cos(d * y)
-    
-    points = []
-    for _ in range(num_points):
-        x, y = np.sin(a * y) - np.cos(b * x), np.sin(c * x) - np.cos(d * y)
-        points.append((x, y))
-    
-    xs, ys = zip(*points)
-    min_x, max_x = min(xs), max(xs)
-    min_y, max_y = min(ys), max(ys)
-    range_x = max_x - min_x if max_x != min_x else 1e-6
-    range_y = max_y - min_y if max_y != min_y else 1e-6
-    
-    for i, (px, py) in enumerate(points):
-        x_coord = int((px - min_x) / range_x * (width - 1))
-        y_coord = int((py - min_y) / range_y * (height - 1))
-        ratio = i / num_points
-        
-        r = int(128 + 127 * ratio)
-        g = int(0 + 255 * ratio)
-        b = int(128 + 127 * ratio)
-        
-        draw.point((x_coord, y_coord), fill=(r, g, b))
-
-    if add_signature:
-        add_signature_to_image(draw, image_size)
-
-    img.save(output_file, dpi=dpi)
-    img.show()
-    print(f"de Jong Attractor saved as {output_file}")
+    blocks = iterate_map_blocks(dejong_step, num_points, num_orbits=num_orbits,
+                                a=2.01, b=-2.53, c=1.61, d=-0.33)
+    frame = render_point_blocks(blocks, num_points, image_size, palette, render_mode,
+                                supersample=supersample, resample=resample)
+    finish_wallpaper(frame, output_file, dpi, add_signature, preview, "de Jong Attractor")
 
 def generate_spirograph(image_size=(3840, 2160), num_points=10000,
                        output_file="D:/Cool Automation Scripts/My Wallpapers/spirograph.png",
-                       dpi=(1000, 1000), add_signature=False):
+                       dpi=(1000, 1000), add_signature=False,
+                       render_mode="lines", supersample=1, resample="lanczos",
+                       palette="purple_white", preview=False):
     """Generates beautiful spirograph pattern."""
-    width, height = image_size
-    img = Image.new("RGB", image_size, "black")
-    draw = ImageDraw.Draw(img)
-    
     R, r, L = 200, 80, 90
     T = 20 * np.pi
-    t_values = np.linspace(0, T, num_points)
-    
-    points = []
-    for t in t_values:
-        x = (R - r) * np.cos(t) + L * np.cos(((R - r) / r) * t)
-        y = (R - r) * np.sin(t) - L * np.sin(((R - r) / r) * t)
-        points.append((x, y))
-    
-    xs, ys = zip(*points)
-    min_x, max_x = min(xs), max(xs)
-    min_y, max_y = min(ys), max(ys)
-    range_x = max_x - min_x if max_x != min_x else 1e-6
-    range_y = max_y - min_y if max_y != min_y else 1e-6
-    
-    for i, (px, py) in enumerate(points):
-        x_coord = int((px - min_x) / range_x * (width - 1))
-        y_coord = int((py - min_y) / range_y * (height - 1))
-        ratio = i / num_points
-        
-        r = int(128 + 127 * ratio)
-        g = int(0 + 255 * ratio)
-        b = int(128 + 127 * ratio)
-        
-        draw.point((x_coord, y_coord), fill=(r, g, b))
-    
-    if add_signature:
-        add_signature_to_image(draw, image_size)
-
-    img.save(output_file, dpi=dpi)
-    img.show()
-    print(f"Spirograph saved as {output_file}")
+
+    def curve(t):
+        return ((R - r) * np.cos(t) + L * np.cos(((R - r) / r) * t),
+                (R - r) * np.sin(t) - L * np.sin(((R - r) / r) * t))
+
+    blocks = parametric_blocks(curve, 0, T, num_points)
+    if render_mode == "lines":
+        frame = render_curve_blocks(blocks, num_points, image_size, palette,
+                                    supersample=supersample, resample=resample)
+    else:
+        frame = render_point_blocks(blocks, num_points, image_size, palette, render_mode,
+                                    supersample=supersample, resample=resample)
+    finish_wallpaper(frame, output_file, dpi, add_signature, preview, "Spirograph")
 
 def generate_clifford_attractor(image_size=(3840, 2160), num_points=300000,
                                output_file="D:/Cool Automation Scripts/My Wallpapers/clifford_attractor.png",
-                               dpi=(1000, 1000), add_signature=False):
+                               dpi=(1000, 1000), add_signature=False,
+                               render_mode="points", num_orbits=1000,
+                               supersample=1, resample="lanczos",
+                               palette="cyan_magenta", preview=False):
     """Generates Clifford attractor with magenta-cyan gradient."""
-    width, height = image_size
-    img = Image.new("RGB", image_size, "black")
-    draw = ImageDraw.Draw(img)
-    
-    a, b, c, d = -1.4, 1.6, 1.0, 0.7
-    x, y = 0.0, 0.0
-    
-    for _ in range(100):
-        x, y = np.sin(a * y) + c * np.cos(a * x), np.sin(b * x) + d * np.cos(b * y)
-    
-    points = []
-    for _ in range(num_points):
-        x, y = np.sin(a * y) + c * np.cos(a * x), np.sin(b * x) + d * np.cos(b * y)
-        points.append((x, y))
-    
-    xs, ys = zip(*points)
-    min_x, max_x = min(xs), max(xs)
-    min_y, max_y = min(ys), max(ys)
-    range_x = max_x - min_x if max_x != min_x else 1e-6
-    range_y = max_y - min_y if max_y != min_y else 1e-6
-    
-    for i, (px, py) in enumerate(points):
-        x_coord = int((px - min_x) / range_x * (width - 1))
-        y_coord = int((py - min_y) / range_y * (height - 1))
-        ratio = i / num_points
-        
-        r = int(255 * ratio)
-        g = int(255 - 255 * ratio)
-        b = int(255)
-        
-        draw.point((x_coord, y_coord), fill=(r, g, b))
-    
-    if add_signature:
-        add_signature_to_image(draw, image_size)
-
-    img.save(output_file, dpi=dpi)
-    img.show()
-    print(f"Clifford Attractor saved as {output_file}")
+    blocks = iterate_map_blocks(clifford_step, num_points, num_orbits=num_orbits,
+                                a=-1.4, b=1.6, c=1.0, d=0.7)
+    frame = render_point_blocks(blocks, num_points, image_size, palette, render_mode,
+                                supersample=supersample, resample=resample)
+    finish_wallpaper(frame, output_file, dpi, add_signature, preview, "Clifford Attractor")
 
 def generate_henon_attractor(image_size=(3840, 2160), num_points=300000,
                             output_file="D:/Cool Automation Scripts/My Wallpapers/henon_attractor.png",
-                            dpi=(1000, 1000), add_signature=False):
+                            dpi=(1000, 1000), add_signature=False,
+                            render_mode="points", num_orbits=1000,
+                            supersample=1, resample="lanczos", palette="deep_blue", preview=False):
     """Generates Hénon map attractor."""
-    width, height = image_size
-    img = Image.new("RGB", image_size, "black")
-    draw = ImageDraw.Draw(img)
-    
-    a, b = 1.4, 0.3
-    x, y = 0.0, 0.0
-    
-    for _ in range(100):
-        x, y = 1 - a * x * x + y, b * x
-    
-    points = []
-    for _ in range(num_points):
-        x, y = 1 - a * x * x + y, b * x
-        points.append((x, y))
-    
-    xs, ys = zip(*points)
-    min_x, max_x = min(xs), max(xs)
-    min_y, max_y = min(ys), max(ys)
-    range_x = max_x - min_x if max_x != min_x else 1e-6
-    range_y = max_y - min_y if max_y != min_y else 1e-6
-    
-    for i, (px, py) in enumerate(points):
-        x_coord = int((px - min_x) / range_x * (width - 1))
-        y_coord = int((py - min_y) / range_y * (height - 1))
-        ratio = i / num_points
-        
-        r = int(0 + 128 * ratio)
-        g = int(0 + 191 * ratio)
-        b = int(128 + 127 * ratio)
-        
-        draw.point((x_coord, y_coord), fill=(r, g, b))
-    
-    if add_signature:
-        add_signature_to_image(draw, image_size)
-    
-    img.save(output_file, dpi=dpi)
-    img.show()
-    print(f"Hénon Attractor saved as {output_file}")
+    blocks = iterate_map_blocks(henon_step, num_points, num_orbits=num_orbits, a=1.4, b=0.3)
+    frame = render_point_blocks(blocks, num_points, image_size, palette, render_mode,
+                                supersample=supersample, resample=resample)
+    finish_wallpaper(frame, output_file, dpi, add_signature, preview, "Hénon Attractor")
 
 def generate_ikeda_attractor(image_size=(3840, 2160), num_points=300000,
                             output_file="D:/Cool Automation Scripts/My Wallpapers/ikeda_attractor.png",
-                            dpi=(1000, 1000), add_signature=False):
+                            dpi=(1000, 1000), add_signature=False,
+                            render_mode="points", num_orbits=1000,
+                            supersample=1, resample="lanczos", palette="navy_cyan", preview=False):
     """Generates Ikeda map attractor."""
-    width, height = image_size
-    img = Image.new("RGB", image_size, "black")
-    draw = ImageDraw.Draw(img)
-    
-    u = 0.9
-    x, y = 0.0, 0.0
-    
-    for _ in range(100):
-        t = 0.4 - 6 / (1 + x*x + y*y)
-        new_x = 1 + u * (x * math.cos(t) - y * math.sin(t))
-        new_y = u * (x * math.sin(t) + y * math.cos(t))
-        x, y = new_x, new_y
-    
-    points = []
-    for _ in range(num_points):
-        t = 0.4 - 6 / (1 + x*x + y*y)
-        new_x = 1 + u * (x * math.cos(t) - y * math.sin(t))
-        new_y = u * (x * math.sin(t) + y * math.cos(t))
-        x, y = new_x, new_y
-        points.append((x, y))
-    
-    xs, ys = zip(*points)
-    min_x, max_x = min(xs), max(xs)
-    min_y, max_y = min(ys), max(ys)
-    range_x = max_x - min_x if max_x != min_x else 1e-6
-    range_y = max_y - min_y if max_y != min_y else 1e-6
-    
-    for i, (px, py) in enumerate(points):
-        x_coord = int((px - min_x) / range_x * (width - 1))
-        y_coord = int((py - min_y) / range_y * (height - 1))
-        ratio = i / num_points
-        
-        r = int(0 + 139 * ratio)
-        g = int(0 + 255 * ratio)
-        b = int(139 + 116 * ratio)
-        
-        draw.point((x_coord, y_coord), fill=(r, g, b))
-    
-    if add_signature:
-        add_signature_to_image(draw, image_size)
-    
-    img.save(output_file, dpi=dpi)
-    img.show()
-    print(f"Ikeda Attractor saved as {output_file}")
+    blocks = iterate_map_blocks(ikeda_step, num_points, num_orbits=num_orbits, u=0.9)
+    frame = render_point_blocks(blocks, num_points, image_size, palette, render_mode,
+                                supersample=supersample, resample=resample)
+    finish_wallpaper(frame, output_file, dpi, add_signature, preview, "Ikeda Attractor")
 
 def generate_lorenz_attractor(image_size=(3840, 2160), num_points=200000,
                              output_file="D:/Cool Automation Scripts/My Wallpapers/lorenz_attractor.png",
-                             dpi=(1000, 1000), add_signature=False):
+                             dpi=(1000, 1000), add_signature=False,
+                             render_mode="points", method="rk4", rtol=1e-3, atol=1e-6,
+                             num_trajectories=1,
+                             supersample=1, resample="lanczos",
+                             palette="red_yellow", preview=False):
     """Generates Lorenz attractor with red-yellow gradient."""
-    width, height = image_size
-    img = Image.new("RGB", image_size, "black")
-    draw = ImageDraw.Draw(img)
-    
-    sigma, beta, rho, dt = 10.0, 8.0/3.0, 28.0, 0.01
-    x, y, z = 1.0, 1.0, 1.0
-    
-    for _ in range(1000):
-        dx = sigma * (y - x)
-        dy = x * (rho - z) - y
-        dz = x * y - beta * z
-        x, y, z = x + dx * dt, y + dy * dt, z + dz * dt
-    
-    points = []
-    for _ in range(num_points):
-        dx = sigma * (y - x)
-        dy = x * (rho - z) - y
-        dz = x * y - beta * z
-        x, y, z = x + dx * dt, y + dy * dt, z + dz * dt
-        points.append((x, z))
-    
-    xs, zs = zip(*points)
-    min_x, max_x = min(xs), max(xs)
-    min_z, max_z = min(zs), max(zs)
-    range_x = max_x - min_x if max_x != min_x else 1e-6
-    range_z = max_z - min_z if max_z != min_z else 1e-6
-    
-    for i, (px, pz) in enumerate(points):
-        x_coord = int((px - min_x) / range_x * (width - 1))
-        z_coord = int((pz - min_z) / range_z * (height - 1))
-        ratio = i / num_points
-        
-        r = int(139 + 116 * ratio)
-        g = int(0 + 255 * ratio)
-        b = int(0)
-        
-        draw.point((x_coord, z_coord), fill=(r, g, b))
-    
-    if add_signature:
-        add_signature_to_image(draw, image_size)
-    
-    img.save(output_file, dpi=dpi)
-    img.show()
-    print(f"Lorenz Attractor saved as {output_file}")
+    sigma, beta, rho = 10.0, 8.0/3.0, 28.0
+    # Covers the time span of num_points Euler steps of 0.01 in a quarter of the steps
+    blocks = trace_attractor(lorenz_field, num_points, image_size, axes=(0, 2),
+                             duration=num_points * 0.01, dt=0.04, method=method,
+                             num_trajectories=num_trajectories, rtol=rtol, atol=atol,
+                             burn_in=10.0, sigma=sigma, beta=beta, rho=rho)
+    frame = render_point_blocks(blocks, num_points, image_size, palette, render_mode,
+                                supersample=supersample, resample=resample)
+    finish_wallpaper(frame, output_file, dpi, add_signature, preview, "Lorenz Attractor")
 
 def generate_julia_set(image_size=(3840, 2160), max_iter=100,
                       output_file="D:/Cool Automation Scripts/My Wallpapers/julia_set.png",
-                      dpi=(1000, 1000), add_signature=False):
+                      dpi=(1000, 1000), add_signature=False, workers=1, smooth=True,
+                      subdivide=False, supersample=1, resample="lanczos",
+                      palette="navy_cyan", preview=False):
     """Generates Julia set fractal with blue-pink gradient."""
-    width, height = image_size
-    img = Image.new("RGB", image_size, "black")
-    draw = ImageDraw.Draw(img)
-
-    c = complex(-0.7, 0.27015)
-    x_min, x_max = -2.0, 2.0
-    y_min, y_max = -2.0, 2.0
-
-    for py in range(0, height, 2):
-        for px in range(0, width, 2):
-            x = x_min + (px / width) * (x_max - x_min)
-            y = y_min + (py / height) * (y_max - y_min)
-            z = complex(x, y)
-
-            n = 0
-            while abs(z) <= 2 and n < max_iter:
-                z = z*z + c
-                n += 1
-
-            if n == max_iter:
-                color = (0, 0, 0)
-            else:
-                ratio = n / max_iter
-                r = int(0 + 139 * ratio)
-                g = int(0 + 255 * ratio)
-                b = int(139 + 116 * ratio)
-                color = (r, g, b)
-
-            for dy in range(2):
-                for dx in range(2):
-                    if px + dx < width and py + dy < height:
-                        draw.point((px + dx, py + dy), fill=color)
-
-    if add_signature:
-        add_signature_to_image(draw, image_size)
-    
-    img.save(output_file, dpi=dpi)
-    img.show()
-    print(f"Julia Set saved as {output_file}")
+    band = partial(escape_time_band, image_size=scale_size(image_size, supersample),
+                   view=(-2.0, 2.0, -2.0, 2.0), rule=mandelbrot_rule, max_iter=max_iter,
+                   colorize=palette, julia_c=complex(-0.7, 0.27015), smooth=smooth,
+                   subdivide=subdivide)
+    frame = render_in_bands(band, image_size, workers, supersample, resample)
+    finish_wallpaper(frame, output_file, dpi, add_signature, preview, "Julia Set")
 
 def generate_mandelbrot_set(image_size=(3840, 2160), max_iter=80,
                            output_file="D:/Cool Automation Scripts/My Wallpapers/mandelbrot_set.png",
-                           dpi=(1000, 1000), add_signature=False):
+                           dpi=(1000, 1000), add_signature=False, workers=1, smooth=True,
+                           subdivide=False, supersample=1, resample="lanczos",
+                           palette="deep_blue", preview=False):
     """Generates Mandelbrot set fractal with deep blue gradient."""
-    width, height = image_size
-    img = Image.new("RGB", image_size, "black")
-    draw = ImageDraw.Draw(img)
-
-    x_min, x_max = -2.5, 1.0
-    y_min, y_max = -1.25, 1.25
-
-    for py in range(0, height, 2):
-        for px in range(0, width, 2):
-            x = x_min + (px / width) * (x_max - x_min)
-            y = y_min + (py / height) * (y_max - y_min)
-            c = complex(x, y)
-            z = 0
-
-            n = 0
-            while abs(z) <= 2 and n < max_iter:
-                z = z*z + c
-                n += 1
-
-            if n == max_iter:
-                color = (0, 0, 0)
-            else:
-                ratio = n / max_iter
-                r = int(0 + 128 * ratio)
-                g = int(0 + 191 * ratio)
-                b = int(128 + 127 * ratio)
-                color = (r, g, b)
-
-            for dy in range(2):
-                for dx in range(2):
-                    if px + dx < width and py + dy < height:
-                        draw.point((px + dx, py + dy), fill=color)
-
-    if add_signature:
-        add_signature_to_image(draw, image_size)
-    
-    img.save(output_file, dpi=dpi)
-    img.show()
-    print(f"Mandelbrot Set saved as {output_file}")
+    band = partial(escape_time_band, image_size=scale_size(image_size, supersample),
+                   view=(-2.5, 1.0, -1.25, 1.25), rule=mandelbrot_rule, max_iter=max_iter,
+                   colorize=palette, smooth=smooth, subdivide=subdivide)
+    frame = render_in_bands(band, image_size, workers, supersample, resample)
+    finish_wallpaper(frame, output_file, dpi, add_signature, preview, "Mandelbrot Set")
+
+def generate_mandelbrot_zoom(image_size=(3840, 2160), max_iter=2000,
+                            center=("-0.743643887037158704752191506114774",
+                                    "0.131825904205311970493132056385139"),
+                            scale="1e-9",
+                            output_file="D:/Cool Automation Scripts/My Wallpapers/mandelbrot_zoom.png",
+                            dpi=(1000, 1000), add_signature=False, workers=1, smooth=True,
+                            supersample=1, resample="lanczos", palette="deep_blue", preview=False):
+    """Generates a deep Mandelbrot zoom via perturbation, down to views about 1e-304 wide."""
+    count_range = zoom_count_range(center, scale, max_iter, image_size, smooth)
+    band = partial(mandelbrot_zoom_band, image_size=scale_size(image_size, supersample),
+                   center=tuple(center), scale=str(scale), max_iter=max_iter, colorize=palette,
+                   smooth=smooth, count_range=count_range)
+    frame = render_in_bands(band, image_size, workers, supersample, resample)
+    finish_wallpaper(frame, output_file, dpi, add_signature, preview, "Mandelbrot Zoom")
 
 def generate_barnsley_fern(image_size=(3840, 2160), num_points=300000,
                           output_file="D:/Cool Automation Scripts/My Wallpapers/barnsley_fern.png",
-                          dpi=(1000, 1000), add_signature=False):
+                          dpi=(1000, 1000), add_signature=False, render_mode="points",
+                          supersample=1, resample="lanczos", palette="fern_green", preview=False):
     """Generates Barnsley fern fractal with green gradient."""
-    width, height = image_size
-    img = Image.new("RGB", image_size, "black")
-    draw = ImageDraw.Draw(img)
-
-    x, y = 0.0, 0.0
-    points = []
-
-    for i in range(num_points):
-        r = random.random()
-        if r < 0.01:
-            x, y = 0, 0.16 * y
-        elif r < 0.86:
-            x, y = 0.85 * x + 0.04 * y, -0.04 * x + 0.85 * y + 1.6
-        elif r < 0.93:
-            x, y = 0.2 * x - 0.26 * y, 0.23 * x + 0.22 * y + 1.6
-        else:
-            x, y = -0.15 * x + 0.28 * y, 0.26 * x + 0.24 * y + 0.44
-
-        points.append((x, y))
-
-    xs, ys = zip(*points)
-    min_x, max_x = min(xs), max(xs)
-    min_y, max_y = min(ys), max(ys)
-    range_x = max_x - min_x if max_x != min_x else 1e-6
-    range_y = max_y - min_y if max_y != min_y else 1e-6
-
-    for i, (px, py) in enumerate(points):
-        x_coord = int((px - min_x) / range_x * (width - 1))
-        y_coord = int((py - min_y) / range_y * (height - 1))
-        ratio = i / num_points
-
-        r = int(0 + 50 * ratio)
-        g = int(50 + 188 * ratio)
-        b = int(0 + 144 * ratio)
-
-        draw.point((x_coord, y_coord), fill=(r, g, b))
-
-    if add_signature:
-        add_signature_to_image(draw, image_size)
-    
-    img.save(output_file, dpi=dpi)
-    img.show()
-    print(f"Barnsley Fern saved as {output_file}")
+    blocks = iterate_ifs_blocks(*IFS_SYSTEMS['barnsley_fern'], num_points)
+    frame = render_point_blocks(blocks, num_points, image_size, palette, render_mode,
+                                supersample=supersample, resample=resample)
+    finish_wallpaper(frame, output_file, dpi, add_signature, preview, "Barnsley Fern")
+
+def generate_ifs_fractal(image_size=(3840, 2160), num_points=20000000,
+                         output_file="D:/Cool Automation Scripts/My Wallpapers/ifs_fractal.png",
+                         dpi=(1000, 1000), add_signature=False, system="heighway_dragon",
+                         render_mode="density", supersample=1, resample="lanczos",
+                         palette="electric_blue", preview=False):
+    """Generates a chaos-game fractal from IFS_SYSTEMS or a custom (maps, probabilities) pair."""
+    maps, probabilities = IFS_SYSTEMS[system] if isinstance(system, str) else system
+    blocks = iterate_ifs_blocks(maps, probabilities, num_points)
+    frame = render_point_blocks(blocks, num_points, image_size, palette, render_mode,
+                                supersample=supersample, resample=resample)
+    finish_wallpaper(frame, output_file, dpi, add_signature, preview, "IFS Fractal")
 
 def generate_lissajous_curve(image_size=(3840, 2160), num_points=50000,
                             output_file="D:/Cool Automation Scripts/My Wallpapers/lissajous_curve.png",
-                            dpi=(1000, 1000), add_signature=False):
+                            dpi=(1000, 1000), add_signature=False,
+                            render_mode="lines", supersample=1, resample="lanczos",
+                            palette="turquoise_white", preview=False):
     """Generates Lissajous curve with turquoise-magenta gradient."""
-    width, height = image_size
-    img = Image.new("RGB", image_size, "black")
-    draw = ImageDraw.Draw(img)
-
     a, b = 3, 2
     delta = np.pi / 2
-    t_values = np.linspace(0, 2 * np.pi, num_points)
-
-    points = []
-    for t in t_values:
-        x = np.sin(a * t + delta)
-        y = np.sin(b * t)
-        points.append((x, y))
-
-    xs, ys = zip(*points)
-    min_x, max_x = min(xs), max(xs)
-    min_y, max_y = min(ys), max(ys)
-    range_x = max_x - min_x if max_x != min_x else 1e-6
-    range_y = max_y - min_y if max_y != min_y else 1e-6
-
-    for i, (px, py) in enumerate(points):
-        x_coord = int((px - min_x) / range_x * (width - 1))
-        y_coord = int((py - min_y) / range_y * (height - 1))
-        ratio = i / num_points
-
-        r = int(64 + 191 * ratio)
-        g = int(224 + 31 * ratio)
-        b = int(208 + 47 * ratio)
 
-        draw.point((x_coord, y_coord), fill=(r, g, b))
+    def curve(t):
+        return np.sin(a * t + delta), np.sin(b * t)
 
-    if add_signature:
-        add_signature_to_image(draw, image_size)
-    
-    img.save(output_file, dpi=dpi)
-    img.show()
-    print(f"Lissajous Curve saved as {output_file}")
+    blocks = parametric_blocks(curve, 0, 2 * np.pi, num_points)
+    if render_mode == "lines":
+        frame = render_curve_blocks(blocks, num_points, image_size, palette,
+                                    supersample=supersample, resample=resample)
+    else:
+        frame = render_point_blocks(blocks, num_points, image_size, palette, render_mode,
+                                    supersample=supersample, resample=resample)
+    finish_wallpaper(frame, output_file, dpi, add_signature, preview, "Lissajous Curve")
 
 # ============================================================================
 # 20 NEW AMAZING MATHEMATICAL WALLPAPER GENERATORS
@@ -550,611 +2116,201 @@ def generate_lissajous_curve(image_size=(3840, 2160), num_points=50000,
 
 def generate_rossler_attractor(image_size=(3840, 2160), num_points=300000,
                               output_file="D:/Cool Automation Scripts/My Wallpapers/rossler_attractor.png",
-                              dpi=(1000, 1000), add_signature=False):
+                              dpi=(1000, 1000), add_signature=False,
+                              render_mode="points", method="rk4", rtol=1e-3, atol=1e-6,
+                              num_trajectories=1,
+                              supersample=1, resample="lanczos", palette="rainbow", preview=False):
     """Generates stunning Rössler attractor with rainbow gradient."""
-    width, height = image_size
-    img = Image.new("RGB", image_size, "black")
-    draw = ImageDraw.Draw(img)
-
     a, b, c = 0.2, 0.2, 5.7
-    x, y, z = 1.0, 1.0, 1.0
-    dt = 0.01
-
-    for _ in range(1000):
-        dx = -y - z
-        dy = x + a * y
-        dz = b + z * (x - c)
-        x, y, z = x + dx * dt, y + dy * dt, z + dz * dt
-
-    points = []
-    for _ in range(num_points):
-        dx = -y - z
-        dy = x + a * y
-        dz = b + z * (x - c)
-        x, y, z = x + dx * dt, y + dy * dt, z + dz * dt
-        points.append((x, y))
-
-    xs, ys = zip(*points)
-    min_x, max_x = min(xs), max(xs)
-    min_y, max_y = min(ys), max(ys)
-    range_x = max_x - min_x if max_x != min_x else 1e-6
-    range_y = max_y - min_y if max_y != min_y else 1e-6
-
-    for i, (px, py) in enumerate(points):
-        x_coord = int((px - min_x) / range_x * (width - 1))
-        y_coord = int((py - min_y) / range_y * (height - 1))
-
-        hue = (i / num_points) * 360
-        if hue < 60:
-            r, g, b = 255, int(255 * hue / 60), 0
-        elif hue < 120:
-            r, g, b = int(255 * (120 - hue) / 60), 255, 0
-        elif hue < 180:
-            r, g, b = 0, 255, int(255 * (hue - 120) / 60)
-        elif hue < 240:
-            r, g, b = 0, int(255 * (240 - hue) / 60), 255
-        elif hue < 300:
-            r, g, b = int(255 * (hue - 240) / 60), 0, 255
-        else:
-            r, g, b = 255, 0, int(255 * (360 - hue) / 60)
-
-        draw.point((x_coord, y_coord), fill=(r, g, b))
-
-    if add_signature:
-        add_signature_to_image(draw, image_size)
-    
-    img.save(output_file, dpi=dpi)
-    img.show()
-    print(f"Rössler Attractor saved as {output_file}")
+    # Covers the time span of num_points Euler steps of 0.01 in a quarter of the steps
+    blocks = trace_attractor(rossler_field, num_points, image_size, axes=(0, 1),
+                             duration=num_points * 0.01, dt=0.04, method=method,
+                             num_trajectories=num_trajectories, rtol=rtol, atol=atol,
+                             burn_in=10.0, a=a, b=b, c=c)
+    frame = render_point_blocks(blocks, num_points, image_size, palette, render_mode,
+                                supersample=supersample, resample=resample)
+    finish_wallpaper(frame, output_file, dpi, add_signature, preview, "Rössler Attractor")
 
 def generate_thomas_attractor(image_size=(3840, 2160), num_points=300000,
                              output_file="D:/Cool Automation Scripts/My Wallpapers/thomas_attractor.png",
-                             dpi=(1000, 1000)):
+                             dpi=(1000, 1000), add_signature=False,
+                             render_mode="points", method="rk4", rtol=1e-3, atol=1e-6,
+                             num_trajectories=1,
+                             supersample=1, resample="lanczos",
+                             palette="electric_blue", preview=False):
     """Generates beautiful Thomas attractor with electric blue gradient."""
-    width, height = image_size
-    img = Image.new("RGB", image_size, "black")
-    draw = ImageDraw.Draw(img)
-
     b = 0.208186
-    x, y, z = 1.0, 1.0, 1.0
-    dt = 0.1
-
-    for _ in range(1000):
-        dx = np.sin(y) - b * x
-        dy = np.sin(z) - b * y
-        dz = np.sin(x) - b * z
-        x, y, z = x + dx * dt, y + dy * dt, z + dz * dt
-
-    points = []
-    for _ in range(num_points):
-        dx = np.sin(y) - b * x
-        dy = np.sin(z) - b * y
-        dz = np.sin(x) - b * z
-        x, y, z = x + dx * dt, y + dy * dt, z + dz * dt
-        points.append((x, z))
-
-    xs, zs = zip(*points)
-    min_x, max_x = min(xs), max(xs)
-    min_z, max_z = min(zs), max(zs)
-    range_x = max_x - min_x if max_x != min_x else 1e-6
-    range_z = max_z - min_z if max_z != min_z else 1e-6
-
-    for i, (px, pz) in enumerate(points):
-        x_coord = int((px - min_x) / range_x * (width - 1))
-        z_coord = int((pz - min_z) / range_z * (height - 1))
-        ratio = i / num_points
-
-        r = int(0 + 100 * ratio)
-        g = int(100 + 155 * ratio)
-        b = int(255)
-
-        draw.point((x_coord, z_coord), fill=(r, g, b))
-
-    if add_signature:
-        add_signature_to_image(draw, image_size)
-    
-    img.save(output_file, dpi=dpi)
-    img.show()
-    print(f"Thomas Attractor saved as {output_file}")
+    # Start off the x = y = z diagonal, which the symmetric field never leaves
+    start = (1.1, 1.1, -0.01)
+    # Covers the time span of num_points Euler steps of 0.1 in a quarter of the steps
+    blocks = trace_attractor(thomas_field, num_points, image_size, axes=(0, 2),
+                             duration=num_points * 0.1, dt=0.4, method=method,
+                             num_trajectories=num_trajectories, rtol=rtol, atol=atol,
+                             burn_in=100.0, initial_state=start, b=b)
+    frame = render_point_blocks(blocks, num_points, image_size, palette, render_mode,
+                                supersample=supersample, resample=resample)
+    finish_wallpaper(frame, output_file, dpi, add_signature, preview, "Thomas Attractor")
 
 def generate_aizawa_attractor(image_size=(3840, 2160), num_points=300000,
                              output_file="D:/Cool Automation Scripts/My Wallpapers/aizawa_attractor.png",
-                             dpi=(1000, 1000), add_signature=False):
+                             dpi=(1000, 1000), add_signature=False,
+                             render_mode="points", method="rk4", rtol=1e-3, atol=1e-6,
+                             num_trajectories=1,
+                             supersample=1, resample="lanczos", palette="cosmic", preview=False):
     """Generates mesmerizing Aizawa attractor with cosmic colors."""
-    width, height = image_size
-    img = Image.new("RGB", image_size, "black")
-    draw = ImageDraw.Draw(img)
-
     a, b, c, d, e, f = 0.95, 0.7, 0.6, 3.5, 0.25, 0.1
-    x, y, z = 1.0, 1.0, 1.0
-    dt = 0.01
-
-    for _ in range(1000):
-        dx = (z - b) * x - d * y
-        dy = d * x + (z - b) * y
-        dz = c + a * z - (z**3)/3 - (x**2 + y**2) * (1 + e * z) + f * z * (x**3)
-        x, y, z = x + dx * dt, y + dy * dt, z + dz * dt
-
-    points = []
-    for _ in range(num_points):
-        dx = (z - b) * x - d * y
-        dy = d * x + (z - b) * y
-        dz = c + a * z - (z**3)/3 - (x**2 + y**2) * (1 + e * z) + f * z * (x**3)
-        x, y, z = x + dx * dt, y + dy * dt, z + dz * dt
-        points.append((x, y))
-
-    xs, ys = zip(*points)
-    min_x, max_x = min(xs), max(xs)
-    min_y, max_y = min(ys), max(ys)
-    range_x = max_x - min_x if max_x != min_x else 1e-6
-    range_y = max_y - min_y if max_y != min_y else 1e-6
-
-    for i, (px, py) in enumerate(points):
-        x_coord = int((px - min_x) / range_x * (width - 1))
-        y_coord = int((py - min_y) / range_y * (height - 1))
-        ratio = i / num_points
-
-        r = int(75 + 180 * ratio)
-        g = int(0 + 215 * ratio)
-        b = int(130 - 130 * ratio)
-
-        draw.point((x_coord, y_coord), fill=(r, g, b))
-
-    if add_signature:
-        add_signature_to_image(draw, image_size)
-    
-    img.save(output_file, dpi=dpi)
-    img.show()
-    print(f"Aizawa Attractor saved as {output_file}")
+    # Covers the time span of num_points Euler steps of 0.01 in a quarter of the steps
+    blocks = trace_attractor(aizawa_field, num_points, image_size, axes=(0, 1),
+                             duration=num_points * 0.01, dt=0.04, method=method,
+                             num_trajectories=num_trajectories, rtol=rtol, atol=atol,
+                             burn_in=10.0, a=a, b=b, c=c, d=d, e=e, f=f)
+    frame = render_point_blocks(blocks, num_points, image_size, palette, render_mode,
+                                supersample=supersample, resample=resample)
+    finish_wallpaper(frame, output_file, dpi, add_signature, preview, "Aizawa Attractor")
 
 def generate_dadras_attractor(image_size=(3840, 2160), num_points=300000,
                              output_file="D:/Cool Automation Scripts/My Wallpapers/dadras_attractor.png",
-                             dpi=(1000, 1000), add_signature=False):
+                             dpi=(1000, 1000), add_signature=False,
+                             render_mode="points", method="rk4", rtol=1e-3, atol=1e-6,
+                             num_trajectories=1,
+                             supersample=1, resample="lanczos", palette="neon", preview=False):
     """Generates electric Dadras attractor with neon lightning effect."""
-    width, height = image_size
-    img = Image.new("RGB", image_size, "black")
-    draw = ImageDraw.Draw(img)
-
     a, b, c, d, e = 3, 2.7, 1.7, 2, 9
-    x, y, z = 1.0, 1.0, 1.0
-    dt = 0.005
-
-    for _ in range(1000):
-        dx = y - a * x + b * y * z
-        dy = c * y - x * z + z
-        dz = d * x * y - e * z
-        x, y, z = x + dx * dt, y + dy * dt, z + dz * dt
-
-    points = []
-    for _ in range(num_points):
-        dx = y - a * x + b * y * z
-        dy = c * y - x * z + z
-        dz = d * x * y - e * z
-        x, y, z = x + dx * dt, y + dy * dt, z + dz * dt
-        points.append((x, z))
-
-    xs, zs = zip(*points)
-    min_x, max_x = min(xs), max(xs)
-    min_z, max_z = min(zs), max(zs)
-    range_x = max_x - min_x if max_x != min_x else 1e-6
-    range_z = max_z - min_z if max_z != min_z else 1e-6
-
-    for i, (px, pz) in enumerate(points):
-        x_coord = int((px - min_x) / range_x * (width - 1))
-        z_coord = int((pz - min_z) / range_z * (height - 1))
-        ratio = i / num_points
-
-        # Electric green to cyan gradient
-        r = int(0 + 64 * ratio)     # Dark to teal
-        g = int(255 - 31 * ratio)   # Bright green to cyan
-        b = int(127 + 128 * ratio)  # Green to bright cyan
-
-        draw.point((x_coord, z_coord), fill=(r, g, b))
-
-    if add_signature:
-        add_signature_to_image(draw, image_size)
-    
-    img.save(output_file, dpi=dpi)
-    img.show()
-    print(f"Dadras Attractor saved as {output_file}")
+    # Covers the time span of num_points Euler steps of 0.005 in a quarter of the steps
+    blocks = trace_attractor(dadras_field, num_points, image_size, axes=(0, 2),
+                             duration=num_points * 0.005, dt=0.02, method=method,
+                             num_trajectories=num_trajectories, rtol=rtol, atol=atol,
+                             burn_in=5.0, a=a, b=b, c=c, d=d, e=e)
+    frame = render_point_blocks(blocks, num_points, image_size, palette, render_mode,
+                                supersample=supersample, resample=resample)
+    finish_wallpaper(frame, output_file, dpi, add_signature, preview, "Dadras Attractor")
 
 def generate_chen_attractor(image_size=(3840, 2160), num_points=300000,
                            output_file="D:/Cool Automation Scripts/My Wallpapers/chen_attractor.png",
-                           dpi=(1000, 1000), add_signature=False):
+                           dpi=(1000, 1000), add_signature=False,
+                           render_mode="points", method="rk4", rtol=1e-3, atol=1e-6,
+                           num_trajectories=1,
+                           supersample=1, resample="lanczos", palette="phoenix", preview=False):
     """Generates fiery Chen attractor with phoenix-like colors."""
-    width, height = image_size
-    img = Image.new("RGB", image_size, "black")
-    draw = ImageDraw.Draw(img)
-
     a, b, c = 5, -10, -0.38
-    x, y, z = 1.0, 1.0, 1.0
-    dt = 0.003
-
-    for _ in range(1000):
-        dx = a * x - y * z
-        dy = b * y + x * z
-        dz = c * z + x * y / 3
-        x, y, z = x + dx * dt, y + dy * dt, z + dz * dt
-
-    points = []
-    for _ in range(num_points):
-        dx = a * x - y * z
-        dy = b * y + x * z
-        dz = c * z + x * y / 3
-        x, y, z = x + dx * dt, y + dy * dt, z + dz * dt
-        points.append((x, y))
-
-    xs, ys = zip(*points)
-    min_x, max_x = min(xs), max(xs)
-    min_y, max_y = min(ys), max(ys)
-    range_x = max_x - min_x if max_x != min_x else 1e-6
-    range_y = max_y - min_y if max_y != min_y else 1e-6
-
-    for i, (px, py) in enumerate(points):
-        x_coord = int((px - min_x) / range_x * (width - 1))
-        y_coord = int((py - min_y) / range_y * (height - 1))
-        ratio = i / num_points
-
-        r = int(255)
-        g = int(0 + 255 * ratio)
-        b = int(0 + 50 * ratio)
-
-        draw.point((x_coord, y_coord), fill=(r, g, b))
-
-    if add_signature:
-        add_signature_to_image(draw, image_size)
-    
-    img.save(output_file, dpi=dpi)
-    img.show()
-    print(f"Chen Attractor saved as {output_file}")
+    # Covers the time span of num_points Euler steps of 0.003 in a quarter of the steps
+    blocks = trace_attractor(chen_field, num_points, image_size, axes=(0, 1),
+                             duration=num_points * 0.003, dt=0.012, method=method,
+                             num_trajectories=num_trajectories, rtol=rtol, atol=atol,
+                             burn_in=3.0, a=a, b=b, c=c)
+    frame = render_point_blocks(blocks, num_points, image_size, palette, render_mode,
+                                supersample=supersample, resample=resample)
+    finish_wallpaper(frame, output_file, dpi, add_signature, preview, "Chen Attractor")
 
 def generate_halvorsen_attractor(image_size=(3840, 2160), num_points=300000,
                                 output_file="D:/Cool Automation Scripts/My Wallpapers/halvorsen_attractor.png",
-                                dpi=(1000, 1000), add_signature=False):
+                                dpi=(1000, 1000), add_signature=False,
+                                render_mode="points", method="rk4", rtol=1e-3, atol=1e-6,
+                                num_trajectories=1,
+                                supersample=1, resample="lanczos", palette="aurora", preview=False):
     """Generates stunning Halvorsen attractor with aurora-like colors."""
-    width, height = image_size
-    img = Image.new("RGB", image_size, "black")
-    draw = ImageDraw.Draw(img)
-
     a = 1.89
-    x, y, z = 1.0, 1.0, 1.0
-    dt = 0.005
-
-    for _ in range(1000):
-        dx = -a * x - 4 * y - 4 * z - y**2
-        dy = -a * y - 4 * z - 4 * x - z**2
-        dz = -a * z - 4 * x - 4 * y - x**2
-        x, y, z = x + dx * dt, y + dy * dt, z + dz * dt
-
-    points = []
-    for _ in range(num_points):
-        dx = -a * x - 4 * y - 4 * z - y**2
-        dy = -a * y - 4 * z - 4 * x - z**2
-        dz = -a * z - 4 * x - 4 * y - x**2
-        x, y, z = x + dx * dt, y + dy * dt, z + dz * dt
-        points.append((x, y))
-
-    xs, ys = zip(*points)
-    min_x, max_x = min(xs), max(xs)
-    min_y, max_y = min(ys), max(ys)
-    range_x = max_x - min_x if max_x != min_x else 1e-6
-    range_y = max_y - min_y if max_y != min_y else 1e-6
-
-    for i, (px, py) in enumerate(points):
-        x_coord = int((px - min_x) / range_x * (width - 1))
-        y_coord = int((py - min_y) / range_y * (height - 1))
-        ratio = i / num_points
-
-        r = int(0 + 100 * ratio)
-        g = int(255 - 100 * ratio)
-        b = int(100 + 155 * ratio)
-
-        draw.point((x_coord, y_coord), fill=(r, g, b))
-
-    if add_signature:
-        add_signature_to_image(draw, image_size)
-    
-    img.save(output_file, dpi=dpi)
-    img.show()
-    print(f"Halvorsen Attractor saved as {output_file}")
+    # Start off the x = y = z diagonal, which the symmetric field never leaves
+    start = (-1.48, -1.51, 2.04)
+    # Covers the time span of num_points Euler steps of 0.005 in a quarter of the steps
+    blocks = trace_attractor(halvorsen_field, num_points, image_size, axes=(0, 1),
+                             duration=num_points * 0.005, dt=0.02, method=method,
+                             num_trajectories=num_trajectories, rtol=rtol, atol=atol,
+                             burn_in=5.0, initial_state=start, a=a)
+    frame = render_point_blocks(blocks, num_points, image_size, palette, render_mode,
+                                supersample=supersample, resample=resample)
+    finish_wallpaper(frame, output_file, dpi, add_signature, preview, "Halvorsen Attractor")
 
 def generate_newton_fractal(image_size=(3840, 2160), max_iter=50,
                            output_file="D:/Cool Automation Scripts/My Wallpapers/newton_fractal.png",
-                           dpi=(1000, 1000), add_signature=False):
+                           dpi=(1000, 1000), add_signature=False, coefficients=(1, 0, 0, -1),
+                           tolerance=1e-6, workers=1,
+                           supersample=1, resample="lanczos", palette="rainbow", preview=False):
     """Generates beautiful Newton fractal with prismatic colors."""
-    width, height = image_size
-    img = Image.new("RGB", image_size, "black")
-    draw = ImageDraw.Draw(img)
-
-    roots = [complex(1, 0), complex(-0.5, 0.866), complex(-0.5, -0.866)]
-    colors = [(255, 0, 0), (0, 255, 0), (0, 0, 255)]
-
-    for py in range(0, height, 2):
-        for px in range(0, width, 2):
-            x = (px - width/2) / (width/4)
-            y = (py - height/2) / (height/4)
-            z = complex(x, y)
-
-            for i in range(max_iter):
-                if abs(z) < 1e-10:
-                    break
-                z = z - (z**3 - 1) / (3 * z**2)
-
-            distances = [abs(z - root) for root in roots]
-            closest_root = distances.index(min(distances))
-
-            base_color = colors[closest_root]
-            intensity = min(1.0, i / max_iter)
-            color = tuple(int(c * intensity) for c in base_color)
-
-            for dy in range(2):
-                for dx in range(2):
-                    if px + dx < width and py + dy < height:
-                        draw.point((px + dx, py + dy), fill=color)
-
-    if add_signature:
-        add_signature_to_image(draw, image_size)
-    
-    img.save(output_file, dpi=dpi)
-    img.show()
-    print(f"Newton Fractal saved as {output_file}")
+    band = partial(newton_band, image_size=scale_size(image_size, supersample),
+                   max_iter=max_iter, coefficients=tuple(coefficients), tolerance=tolerance,
+                   palette=palette)
+    frame = render_in_bands(band, image_size, workers, supersample, resample)
+    finish_wallpaper(frame, output_file, dpi, add_signature, preview, "Newton Fractal")
 
 def generate_burning_ship(image_size=(3840, 2160), max_iter=100,
                          output_file="D:/Cool Automation Scripts/My Wallpapers/burning_ship.png",
-                         dpi=(1000, 1000), add_signature=False):
+                         dpi=(1000, 1000), add_signature=False, workers=1, smooth=True,
+                         subdivide=False, supersample=1, resample="lanczos",
+                         palette="lava", preview=False):
     """Generates dramatic Burning Ship fractal with lava colors."""
-    width, height = image_size
-    img = Image.new("RGB", image_size, "black")
-    draw = ImageDraw.Draw(img)
-
-    x_min, x_max = -2.5, 1.5
-    y_min, y_max = -2.0, 1.0
-
-    for py in range(0, height, 2):
-        for px in range(0, width, 2):
-            x = x_min + (px / width) * (x_max - x_min)
-            y = y_min + (py / height) * (y_max - y_min)
-            c = complex(x, y)
-            z = 0
-
-            n = 0
-            while abs(z) <= 2 and n < max_iter:
-                z = complex(abs(z.real), abs(z.imag))**2 + c
-                n += 1
-
-            if n == max_iter:
-                color = (0, 0, 0)
-            else:
-                ratio = n / max_iter
-                r = int(255 * min(1, ratio * 2))
-                g = int(255 * max(0, ratio - 0.5) * 2)
-                b = int(50 * ratio)
-                color = (r, g, b)
-
-            for dy in range(2):
-                for dx in range(2):
-                    if px + dx < width and py + dy < height:
-                        draw.point((px + dx, py + dy), fill=color)
-
-    if add_signature:
-        add_signature_to_image(draw, image_size)
-    
-    img.save(output_file, dpi=dpi)
-    img.show()
-    print(f"Burning Ship Fractal saved as {output_file}")
+    band = partial(escape_time_band, image_size=scale_size(image_size, supersample),
+                   view=(-2.5, 1.5, -2.0, 1.0), rule=burning_ship_rule, max_iter=max_iter,
+                   colorize=palette, smooth=smooth, subdivide=subdivide)
+    frame = render_in_bands(band, image_size, workers, supersample, resample)
+    finish_wallpaper(frame, output_file, dpi, add_signature, preview, "Burning Ship Fractal")
 
 def generate_tricorn_fractal(image_size=(3840, 2160), max_iter=100,
                             output_file="D:/Cool Automation Scripts/My Wallpapers/tricorn_fractal.png",
-                            dpi=(1000, 1000), add_signature=False):
+                            dpi=(1000, 1000), add_signature=False, workers=1, smooth=True,
+                            subdivide=False, supersample=1, resample="lanczos",
+                            palette="ice", preview=False):
     """Generates crystalline Tricorn fractal with ice-like colors."""
-    width, height = image_size
-    img = Image.new("RGB", image_size, "black")
-    draw = ImageDraw.Draw(img)
-
-    x_min, x_max = -2.5, 1.0
-    y_min, y_max = -1.5, 1.5
-
-    for py in range(0, height, 2):
-        for px in range(0, width, 2):
-            x = x_min + (px / width) * (x_max - x_min)
-            y = y_min + (py / height) * (y_max - y_min)
-            c = complex(x, y)
-            z = 0
-
-            n = 0
-            while abs(z) <= 2 and n < max_iter:
-                z = z.conjugate()**2 + c
-                n += 1
-
-            if n == max_iter:
-                color = (0, 0, 0)
-            else:
-                ratio = n / max_iter
-                r = int(100 + 155 * ratio)
-                g = int(150 + 105 * ratio)
-                b = int(255)
-                color = (r, g, b)
-
-            for dy in range(2):
-                for dx in range(2):
-                    if px + dx < width and py + dy < height:
-                        draw.point((px + dx, py + dy), fill=color)
-
-    if add_signature:
-        add_signature_to_image(draw, image_size)
-    
-    img.save(output_file, dpi=dpi)
-    img.show()
-    print(f"Tricorn Fractal saved as {output_file}")
+    band = partial(escape_time_band, image_size=scale_size(image_size, supersample),
+                   view=(-2.5, 1.0, -1.5, 1.5), rule=tricorn_rule, max_iter=max_iter,
+                   colorize=palette, smooth=smooth, subdivide=subdivide)
+    frame = render_in_bands(band, image_size, workers, supersample, resample)
+    finish_wallpaper(frame, output_file, dpi, add_signature, preview, "Tricorn Fractal")
 
 def generate_pickover_attractor(image_size=(3840, 2160), num_points=300000,
                                output_file="D:/Cool Automation Scripts/My Wallpapers/pickover_attractor.png",
-                               dpi=(1000, 1000), add_signature=False):
+                               dpi=(1000, 1000), add_signature=False,
+                               render_mode="points", num_orbits=1000,
+                               supersample=1, resample="lanczos",
+                               palette="green_magenta", preview=False):
     """Generates alien-like Pickover attractor with otherworldly colors."""
-    width, height = image_size
-    img = Image.new("RGB", image_size, "black")
-    draw = ImageDraw.Draw(img)
-
-    a, b, c, d = 2.24, 0.43, -0.65, -2.43
-    x, y = 0.0, 0.0
-
-    points = []
-    for _ in range(num_points):
-        new_x = np.sin(a * y) + c * np.cos(a * x)
-        new_y = np.sin(b * x) + d * np.cos(b * y)
-        x, y = new_x, new_y
-        points.append((x, y))
-
-    xs, ys = zip(*points)
-    min_x, max_x = min(xs), max(xs)
-    min_y, max_y = min(ys), max(ys)
-    range_x = max_x - min_x if max_x != min_x else 1e-6
-    range_y = max_y - min_y if max_y != min_y else 1e-6
-
-    for i, (px, py) in enumerate(points):
-        x_coord = int((px - min_x) / range_x * (width - 1))
-        y_coord = int((py - min_y) / range_y * (height - 1))
-        ratio = i / num_points
-
-        r = int(100 + 155 * ratio)
-        g = int(255 - 155 * ratio)
-        b = int(100 + 155 * ratio)
-
-        draw.point((x_coord, y_coord), fill=(r, g, b))
-
-    if add_signature:
-        add_signature_to_image(draw, image_size)
-    
-    img.save(output_file, dpi=dpi)
-    img.show()
-    print(f"Pickover Attractor saved as {output_file}")
+    blocks = iterate_map_blocks(clifford_step, num_points, num_orbits=num_orbits,
+                                a=2.24, b=0.43, c=-0.65, d=-2.43)
+    frame = render_point_blocks(blocks, num_points, image_size, palette, render_mode,
+                                supersample=supersample, resample=resample)
+    finish_wallpaper(frame, output_file, dpi, add_signature, preview, "Pickover Attractor")
 
 def generate_gingerbreadman_map(image_size=(3840, 2160), num_points=300000,
                                output_file="D:/Cool Automation Scripts/My Wallpapers/gingerbreadman_map.png",
-                               dpi=(1000, 1000), add_signature=False):
+                               dpi=(1000, 1000), add_signature=False,
+                               render_mode="points", num_orbits=1000,
+                               supersample=1, resample="lanczos",
+                               palette="gingerbread", preview=False):
     """Generates whimsical Gingerbreadman map with warm cookie colors."""
-    width, height = image_size
-    img = Image.new("RGB", image_size, "black")
-    draw = ImageDraw.Draw(img)
-
-    x, y = 0.0, 0.0
-    points = []
-
-    for _ in range(num_points):
-        new_x = 1 - y + abs(x)
-        new_y = x
-        x, y = new_x, new_y
-        points.append((x, y))
-
-    xs, ys = zip(*points)
-    min_x, max_x = min(xs), max(xs)
-    min_y, max_y = min(ys), max(ys)
-    range_x = max_x - min_x if max_x != min_x else 1e-6
-    range_y = max_y - min_y if max_y != min_y else 1e-6
-
-    for i, (px, py) in enumerate(points):
-        x_coord = int((px - min_x) / range_x * (width - 1))
-        y_coord = int((py - min_y) / range_y * (height - 1))
-        ratio = i / num_points
-
-        r = int(139 + 116 * ratio)
-        g = int(69 + 146 * ratio)
-        b = int(19 + 81 * ratio)
-
-        draw.point((x_coord, y_coord), fill=(r, g, b))
-
-    if add_signature:
-        add_signature_to_image(draw, image_size)
-    
-    img.save(output_file, dpi=dpi)
-    img.show()
-    print(f"Gingerbreadman Map saved as {output_file}")
+    blocks = iterate_map_blocks(gingerbreadman_step, num_points, num_orbits=num_orbits, spread=1.0)
+    frame = render_point_blocks(blocks, num_points, image_size, palette, render_mode,
+                                supersample=supersample, resample=resample)
+    finish_wallpaper(frame, output_file, dpi, add_signature, preview, "Gingerbreadman Map")
 
 def generate_tinkerbell_map(image_size=(3840, 2160), num_points=300000,
                            output_file="D:/Cool Automation Scripts/My Wallpapers/tinkerbell_map.png",
-                           dpi=(1000, 1000), add_signature=False):
+                           dpi=(1000, 1000), add_signature=False,
+                           render_mode="points", num_orbits=1000,
+                           supersample=1, resample="lanczos", palette="fairy_dust", preview=False):
     """Generates magical Tinkerbell map with sparkling fairy dust colors."""
-    width, height = image_size
-    img = Image.new("RGB", image_size, "black")
-    draw = ImageDraw.Draw(img)
-
-    a, b, c, d = 0.9, -0.6013, 2.0, 0.50
-    x, y = 0.0, 0.0
-
-    points = []
-    for _ in range(num_points):
-        new_x = x**2 - y**2 + a * x + b * y
-        new_y = 2 * x * y + c * x + d * y
-        x, y = new_x, new_y
-        points.append((x, y))
-
-    xs, ys = zip(*points)
-    min_x, max_x = min(xs), max(xs)
-    min_y, max_y = min(ys), max(ys)
-    range_x = max_x - min_x if max_x != min_x else 1e-6
-    range_y = max_y - min_y if max_y != min_y else 1e-6
-
-    for i, (px, py) in enumerate(points):
-        x_coord = int((px - min_x) / range_x * (width - 1))
-        y_coord = int((py - min_y) / range_y * (height - 1))
-        ratio = i / num_points
-
-        r = int(255)
-        g = int(105 + 150 * ratio)
-        b = int(180 - 180 * ratio)
-
-        draw.point((x_coord, y_coord), fill=(r, g, b))
-
-    if add_signature:
-        add_signature_to_image(draw, image_size)
-    
-    img.save(output_file, dpi=dpi)
-    img.show()
-    print(f"Tinkerbell Map saved as {output_file}")
+    blocks = iterate_map_blocks(tinkerbell_step, num_points, seed_point=(-0.72, -0.64),
+                                num_orbits=num_orbits, a=0.9, b=-0.6013, c=2.0, d=0.50)
+    frame = render_point_blocks(blocks, num_points, image_size, palette, render_mode,
+                                supersample=supersample, resample=resample)
+    finish_wallpaper(frame, output_file, dpi, add_signature, preview, "Tinkerbell Map")
 
 def generate_four_wing_attractor(image_size=(3840, 2160), num_points=300000,
                                 output_file="D:/Cool Automation Scripts/My Wallpapers/four_wing_attractor.png",
-                                dpi=(1000, 1000), add_signature=False):
+                                dpi=(1000, 1000), add_signature=False,
+                                render_mode="points", method="rk4", rtol=1e-3, atol=1e-6,
+                                num_trajectories=1,
+                                supersample=1, resample="lanczos",
+                                palette="orange_blue", preview=False):
     """Generates magnificent Four Wing attractor with butterfly-like colors."""
-    width, height = image_size
-    img = Image.new("RGB", image_size, "black")
-    draw = ImageDraw.Draw(img)
-
     a, b, c = 0.2, 0.01, -0.4
-    x, y, z = 1.0, 1.0, 1.0
-    dt = 0.01
-
-    points = []
-    for _ in range(num_points):
-        dx = a * x + y * z
-        dy = b * x + c * y - x * z
-        dz = -z - x * y
-        x, y, z = x + dx * dt, y + dy * dt, z + dz * dt
-        points.append((x, y))
-
-    xs, ys = zip(*points)
-    min_x, max_x = min(xs), max(xs)
-    min_y, max_y = min(ys), max(ys)
-    range_x = max_x - min_x if max_x != min_x else 1e-6
-    range_y = max_y - min_y if max_y != min_y else 1e-6
-
-    for i, (px, py) in enumerate(points):
-        x_coord = int((px - min_x) / range_x * (width - 1))
-        y_coord = int((py - min_y) / range_y * (height - 1))
-        ratio = i / num_points
-
-        r = int(255 - 255 * ratio)
-        g = int(165 - 165 * ratio)
-        b = int(0 + 255 * ratio)
-
-        draw.point((x_coord, y_coord), fill=(r, g, b))
-
-    if add_signature:
-        add_signature_to_image(draw, image_size)
-    
-    img.save(output_file, dpi=dpi)
-    img.show()
-    print(f"Four Wing Attractor saved as {output_file}")
+    # Covers the time span of num_points Euler steps of 0.01 in a quarter of the steps
+    blocks = trace_attractor(four_wing_field, num_points, image_size, axes=(0, 1),
+                             duration=num_points * 0.01, dt=0.04, method=method,
+                             num_trajectories=num_trajectories, rtol=rtol, atol=atol,
+                             a=a, b=b, c=c)
+    frame = render_point_blocks(blocks, num_points, image_size, palette, render_mode,
+                                supersample=supersample, resample=resample)
+    finish_wallpaper(frame, output_file, dpi, add_signature, preview, "Four Wing Attractor")
 
 # ============================================================================
 # COMPREHENSIVE WALLPAPER MENU SYSTEM
@@ -1245,7 +2401,7 @@ def generate_wallpaper_by_choice(choice):
         for i in range(1, 15):
             try:
                 print(f"\n📊 Generating wallpaper {i}/14...")
-                wallpaper_functions[i](add_signature=add_sig)
+                wallpaper_functions[i](add_signature=add_sig, preview=True)
             except Exception as e:
                 print(f"❌ Error generating wallpaper {i}: {e}")
 
@@ -1256,7 +2412,7 @@ def generate_wallpaper_by_choice(choice):
         add_sig = get_signature_preference()
         try:
             print(f"\n🎨 Generating your chosen wallpaper...")
-            wallpaper_functions[choice](add_signature=add_sig)
+            wallpaper_functions[choice](add_signature=add_sig, preview=True)
             print("✅ Wallpaper generated successfully!")
         except Exception as e:
             print(f"❌ Error generating wallpaper: {e}")
@@ -1265,8 +2421,8 @@ def generate_wallpaper_by_choice(choice):
         print("❌ Invalid choice. Please try again.")
         return True
 
-def main():
-    """Main function to run the wallpaper generator."""
+def run_menu():
+    """Interactive menu loop for generating wallpapers one at a time."""
     print("🎨 Welcome to the Complete Mathematical Wallpaper Generator!")
     print("This collection includes 14 beautiful mathematical patterns!")
 
@@ -1280,5 +2436,183 @@ def main():
         if choice != 25:  # Don't pause after generating all
             input("\nPress Enter to continue...")
 
+# ============================================================================
+# COMMAND LINE INTERFACE
+# ============================================================================
+
+WALLPAPER_GENERATORS = {
+    name[len("generate_"):]: function
+    for name, function in list(globals().items())
+    if name.startswith("generate_") and name != "generate_wallpaper_by_choice"
+}
+
+ANIMATIONS = {
+    name[len("animate_"):]: function
+    for name, function in list(globals().items())
+    if name.startswith("animate_")
+}
+
+def parse_image_size(text):
+    """Parse a WIDTHxHEIGHT resolution such as 3840x2160."""
+    try:
+        width, height = (int(part) for part in text.lower().split("x"))
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"expected WIDTHxHEIGHT, got {text!r}")
+    if width <= 0 or height <= 0:
+        raise argparse.ArgumentTypeError(f"resolution must be positive, got {text!r}")
+    return width, height
+
+def render_wallpapers(names, image_size=(3840, 2160), output_dir="wallpapers", workers=1,
+                      image_format="png", dpi=(1000, 1000), add_signature=False, preview=False,
+                      palette=None, supersample=1, resample="lanczos"):
+    """
+    Renders the named wallpapers without any interaction.
+
+    workers is passed to generators that can split a single render across
+    processes, and palette (a PALETTES name) to generators that take one;
+    None keeps each generator's own palette. supersample and resample go to
+    the generators that support supersampling. Returns the names that
+    failed; one failure does not stop the remaining wallpapers.
+    """
+    os.makedirs(output_dir, exist_ok=True)
+    failed = []
+    for name in names:
+        function = WALLPAPER_GENERATORS[name]
+        kwargs = {
+            'image_size': image_size,
+            'output_file': os.path.join(output_dir, f"{name}.{image_format}"),
+            'dpi': dpi,
+            'add_signature': add_signature,
+            'preview': preview,
+        }
+        parameters = inspect.signature(function).parameters
+        if 'workers' in parameters:
+            kwargs['workers'] = workers
+        if palette is not None and 'palette' in parameters:
+            kwargs['palette'] = palette
+        if supersample > 1 and 'supersample' in parameters:
+            kwargs['supersample'] = supersample
+            kwargs['resample'] = resample
+        try:
+            function(**kwargs)
+        except Exception as e:
+            print(f"❌ Error generating {name}: {e}", file=sys.stderr)
+            failed.append(name)
+    return failed
+
+def build_arg_parser():
+    """Command line: list, palettes, render, animate and the interactive menu."""
+    parser = argparse.ArgumentParser(
+        description="Render mathematical wallpapers.",
+        epilog="Run without a command on a terminal to get the interactive menu.")
+    commands = parser.add_subparsers(dest="command")
+
+    commands.add_parser("list", help="list the available wallpaper generators")
+    commands.add_parser("palettes", help="list the named color palettes")
+    commands.add_parser("menu", help="interactive menu")
+
+    render = commands.add_parser("render", help="render wallpapers unattended")
+    render.add_argument("names", nargs="+", metavar="NAME",
+                        help="generator names from 'list', or 'all'")
+    render.add_argument("--size", type=parse_image_size, default=(3840, 2160),
+                        help="output resolution as WIDTHxHEIGHT (default: 3840x2160)")
+    render.add_argument("--output-dir", default="wallpapers",
+                        help="directory to write images to (default: wallpapers)")
+    render.add_argument("--workers", type=int, default=1,
+                        help="processes per render for generators that support it")
+    render.add_argument("--format", dest="image_format", default="png",
+                        choices=["png", "jpg", "webp", "avif", "tiff"],
+                        help="image file format (default: png)")
+    render.add_argument("--siblings", nargs="+", default=[], metavar="FORMAT",
+                        help="also write each image in these formats, e.g. webp avif")
+    render.add_argument("--variants", nargs="+", default=[], metavar="SIZE",
+                        choices=list(VARIANT_WIDTHS) + ["all"],
+                        help=f"also write downsized copies: {', '.join(VARIANT_WIDTHS)} or all")
+    render.add_argument("--quality", type=int, default=None,
+                        help="JPEG/WebP/AVIF quality 1-100 (default: per format)")
+    render.add_argument("--compress-level", type=int, default=None, choices=range(10),
+                        metavar="0-9", help="PNG zlib level (default: 6)")
+    render.add_argument("--draft", action="store_true",
+                        help="fastest encoder settings, for previews")
+    render.add_argument("--palette", choices=list(PALETTES), metavar="PALETTE",
+                        help="recolor with a palette from 'palettes' (default: each generator's own)")
+    render.add_argument("--supersample", type=int, default=1, metavar="K",
+                        help="render K times larger and downsample, for antialiasing (default: 1)")
+    render.add_argument("--resample", choices=RESAMPLE_FILTERS, default="lanczos",
+                        help="downsampling filter for --supersample (default: lanczos)")
+    render.add_argument("--dpi", type=int, default=1000, help="DPI stored in the file")
+    render.add_argument("--signature", action="store_true",
+                        help="add the @aeronautyy signature")
+    render.add_argument("--preview", action="store_true",
+                        help="open each image in the system viewer after saving")
+
+    animate = commands.add_parser("animate", help="render a frame sequence or video")
+    animate.add_argument("name", choices=list(ANIMATIONS), metavar="NAME",
+                         help=f"one of: {', '.join(ANIMATIONS)}")
+    animate.add_argument("output", nargs="?",
+                         help="frame pattern such as frames/zoom_{:04d}.png, or a video "
+                              f"file ({', '.join(VIDEO_EXTENSIONS)}) encoded with ffmpeg")
+    animate.add_argument("--frames", type=int, default=600, help="number of frames (default: 600)")
+    animate.add_argument("--size", type=parse_image_size, default=(1920, 1080),
+                         help="frame resolution as WIDTHxHEIGHT (default: 1920x1080)")
+    animate.add_argument("--workers", type=int, default=1,
+                         help="frames rendered in parallel (default: 1)")
+    animate.add_argument("--fps", type=int, default=30, help="video frame rate (default: 30)")
+    animate.add_argument("--palette", choices=list(PALETTES), metavar="PALETTE",
+                         help="palette from 'palettes' (default: the animation's own)")
+    return parser
+
+def main(argv=None):
+    """Main function to run the wallpaper generator."""
+    parser = build_arg_parser()
+    args = parser.parse_args(argv)
+
+    if args.command is None:
+        if sys.stdin.isatty():
+            run_menu()
+            return 0
+        parser.print_help()
+        return 2
+    if args.command == "menu":
+        run_menu()
+        return 0
+    if args.command == "list":
+        for name, function in WALLPAPER_GENERATORS.items():
+            print(f"{name:<22} {function.__doc__.strip()}")
+        return 0
+    if args.command == "palettes":
+        for name in PALETTES:
+            print(name)
+        return 0
+
+    if args.command == "animate":
+        kwargs = {'num_frames': args.frames, 'image_size': args.size,
+                  'workers': args.workers, 'fps': args.fps}
+        if args.output is not None:
+            kwargs['output'] = args.output
+        if args.palette is not None:
+            kwargs['palette'] = args.palette
+        try:
+            ANIMATIONS[args.name](**kwargs)
+        except (ValueError, RuntimeError) as e:
+            print(f"❌ Error animating {args.name}: {e}", file=sys.stderr)
+            return 1
+        return 0
+
+    names = list(WALLPAPER_GENERATORS) if args.names == ["all"] else args.names
+    unknown = [name for name in names if name not in WALLPAPER_GENERATORS]
+    if unknown:
+        parser.error(f"unknown wallpaper(s): {', '.join(unknown)}; see 'list'")
+    try:
+        save_format(f"wallpaper.{args.image_format}")
+        configure_saving(args.quality, args.compress_level, args.draft, args.siblings,
+                         args.variants)
+    except ValueError as e:
+        parser.error(str(e))
+    failed = render_wallpapers(names, args.size, args.output_dir, args.workers,
+                               args.image_format, (args.dpi, args.dpi), args.signature,
+                               args.preview, args.palette, args.supersample, args.resample)
+    return 1 if failed else 0
+
 if __name__ == "__main__":
-    main()
+    sys.exit(main())
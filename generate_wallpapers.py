@@ -3,191 +3,662 @@
 Generate sample mathematical wallpapers for the website
 """
 
+import argparse
+import hashlib
+import inspect
+import json
+import multiprocessing
+import multiprocessing.connection
 import os
+import re
+import shutil
 import sys
+import time
+import types
+from collections import deque
+from functools import partial
 from MathematicalWallpapers import *
 
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
 def create_wallpapers_directory():
     """Create wallpapers directory if it doesn't exist"""
     if not os.path.exists("wallpapers"):
         os.makedirs("wallpapers")
         print("Created wallpapers directory")
 
-def generate_sample_wallpapers():
+WALLPAPERS = [
+    # Original 6 wallpapers
+    {
+        'name': 'Mandelbrot Set',
+        'function': generate_mandelbrot_set,
+        'file': 'wallpapers/mandelbrot_set.png',
+        'description': 'The iconic Mandelbrot set fractal'
+    },
+    {
+        'name': 'Julia Set',
+        'function': generate_julia_set,
+        'file': 'wallpapers/julia_set.png',
+        'description': 'Beautiful Julia set fractal'
+    },
+    {
+        'name': 'Lorenz Attractor',
+        'function': generate_lorenz_attractor,
+        'file': 'wallpapers/lorenz_attractor.png',
+        'description': 'The famous butterfly effect attractor'
+    },
+    {
+        'name': 'Barnsley Fern',
+        'function': generate_barnsley_fern,
+        'file': 'wallpapers/barnsley_fern.png',
+        'description': 'Nature-inspired fractal fern'
+    },
+    {
+        'name': 'Clifford Attractor',
+        'function': generate_clifford_attractor,
+        'file': 'wallpapers/clifford_attractor.png',
+        'description': 'Mesmerizing strange attractor'
+    },
+    {
+        'name': 'Burning Ship',
+        'function': generate_burning_ship,
+        'file': 'wallpapers/burning_ship.png',
+        'description': 'Dramatic fractal with lava-like appearance'
+    },
+    # Additional wallpapers
+    {
+        'name': 'Random Math Art',
+        'function': generate_random_math_art,
+        'file': 'wallpapers/random_math_art.png',
+        'description': 'Random mathematical art using sine-cosine functions'
+    },
+    {
+        'name': 'De Jong Attractor',
+        'function': generate_dejong_attractor,
+        'file': 'wallpapers/dejong_attractor.png',
+        'description': 'De Jong attractor with beautiful gradient'
+    },
+    {
+        'name': 'Spirograph',
+        'function': generate_spirograph,
+        'file': 'wallpapers/spirograph.png',
+        'description': 'Beautiful spirograph pattern'
+    },
+    {
+        'name': 'Henon Attractor',
+        'function': generate_henon_attractor,
+        'file': 'wallpapers/henon_attractor.png',
+        'description': 'Hénon map attractor'
+    },
+    {
+        'name': 'Ikeda Attractor',
+        'function': generate_ikeda_attractor,
+        'file': 'wallpapers/ikeda_attractor.png',
+        'description': 'Ikeda map attractor'
+    },
+    {
+        'name': 'Lissajous Curve',
+        'function': generate_lissajous_curve,
+        'file': 'wallpapers/lissajous_curve.png',
+        'description': 'Lissajous curve with turquoise-magenta gradient'
+    },
+    {
+        'name': 'Rossler Attractor',
+        'function': generate_rossler_attractor,
+        'file': 'wallpapers/rossler_attractor.png',
+        'description': 'Stunning Rössler attractor with rainbow gradient'
+    },
+    {
+        'name': 'Thomas Attractor',
+        'function': generate_thomas_attractor,
+        'file': 'wallpapers/thomas_attractor.png',
+        'description': 'Beautiful Thomas attractor with electric blue gradient'
+    },
+    {
+        'name': 'Aizawa Attractor',
+        'function': generate_aizawa_attractor,
+        'file': 'wallpapers/aizawa_attractor.png',
+        'description': 'Mesmerizing Aizawa attractor with cosmic colors'
+    },
+    {
+        'name': 'Dadras Attractor',
+        'function': generate_dadras_attractor,
+        'file': 'wallpapers/dadras_attractor.png',
+        'description': 'Electric Dadras attractor with neon lightning effect'
+    },
+    {
+        'name': 'Chen Attractor',
+        'function': generate_chen_attractor,
+        'file': 'wallpapers/chen_attractor.png',
+        'description': 'Fiery Chen attractor with phoenix-like colors'
+    },
+    {
+        'name': 'Halvorsen Attractor',
+        'function': generate_halvorsen_attractor,
+        'file': 'wallpapers/halvorsen_attractor.png',
+        'description': 'Stunning Halvorsen attractor with aurora-like colors'
+    },
+    {
+        'name': 'Newton Fractal',
+        'function': generate_newton_fractal,
+        'file': 'wallpapers/newton_fractal.png',
+        'description': 'Beautiful Newton fractal with prismatic colors'
+    },
+    {
+        'name': 'Tricorn Fractal',
+        'function': generate_tricorn_fractal,
+        'file': 'wallpapers/tricorn_fractal.png',
+        'description': 'Crystalline Tricorn fractal with ice-like colors'
+    },
+    {
+        'name': 'Pickover Attractor',
+        'function': generate_pickover_attractor,
+        'file': 'wallpapers/pickover_attractor.png',
+        'description': 'Alien-like Pickover attractor with otherworldly colors'
+    },
+    {
+        'name': 'Gingerbreadman Map',
+        'function': generate_gingerbreadman_map,
+        'file': 'wallpapers/gingerbreadman_map.png',
+        'description': 'Whimsical Gingerbreadman map with warm cookie colors'
+    },
+    {
+        'name': 'Tinkerbell Map',
+        'function': generate_tinkerbell_map,
+        'file': 'wallpapers/tinkerbell_map.png',
+        'description': 'Magical Tinkerbell map with sparkling fairy dust colors'
+    },
+    {
+        'name': 'Four Wing Attractor',
+        'function': generate_four_wing_attractor,
+        'file': 'wallpapers/four_wing_attractor.png',
+        'description': 'Magnificent Four Wing attractor with butterfly-like colors'
+    }
+]
+
+TIMINGS_FILE = ".render_timings.json"
+CACHE_DIR = ".render_cache"
+MANIFEST_FILE = "wallpapers/manifest.json"
+MANIFEST_SCRIPT = "js/wallpaper-variants.js"
+GALLERY_PAGE = "mathematical-wallpapers.html"
+# Rendered width of a gallery card: one column, two from Tailwind's lg
+# breakpoint up, inside the gallery's 1400px container
+GALLERY_SIZES = "(min-width: 1400px) 700px, (min-width: 1024px) 50vw, 100vw"
+
+# Generator parameters that change how a render runs but not the pixels it produces
+OUTPUT_NEUTRAL_PARAMS = {'output_file', 'workers'}
+
+def job_kwargs(wallpaper):
+    """Keyword arguments a wallpaper's generator is called with."""
+    return {'output_file': wallpaper['file'], 'add_signature': True,
+            **wallpaper.get('params', {})}
+
+# Module-level settings that change how a render is run or saved but not its pixels
+OUTPUT_NEUTRAL_GLOBALS = {'SAVE_SETTINGS', 'MEMMAP_THRESHOLD', 'MEMMAP_DIR'}
+
+def code_fingerprint(function):
+    """
+    Hashes the source of a generator and every function it reaches.
+
+    Module-level functions named anywhere in the generator's code (including
+    lambdas and partial arguments) are followed recursively, so editing a
+    shared helper invalidates exactly the generators that use it. Module-level
+    data those functions read (palettes, IFS maps, constants) is hashed too,
+    and functions stored in it are followed like named ones.
+    """
+    found = {}
+    stack = [function]
+    while stack:
+        fn = stack.pop()
+        if isinstance(fn, partial):
+            stack.append(fn.func)
+            stack.extend(value for value in fn.keywords.values() if callable(value))
+            continue
+        if hasattr(fn, '__wrapped__'):
+            stack.append(fn.__wrapped__)
+            continue
+        if not inspect.isfunction(fn) or fn.__module__ != function_module(function):
+            continue
+        name = f"{fn.__module__}.{fn.__qualname__}"
+        if name in found:
+            continue
+        found[name] = inspect.getsource(fn)
+
+        codes = [fn.__code__]
+        while codes:
+            code = codes.pop()
+            codes.extend(const for const in code.co_consts if isinstance(const, types.CodeType))
+            for ref in code.co_names:
+                if ref not in fn.__globals__ or ref in OUTPUT_NEUTRAL_GLOBALS:
+                    continue
+                value = fn.__globals__[ref]
+                if callable(value) or isinstance(value, types.ModuleType):
+                    stack.append(value)
+                else:
+                    found.setdefault(f"{fn.__module__}.{ref}", describe_data(value, stack))
+
+    digest = hashlib.sha256()
+    for name in sorted(found):
+        digest.update(name.encode())
+        digest.update(found[name].encode())
+    return digest.hexdigest()
+
+def describe_data(value, stack):
+    """
+    Text that changes whenever module-level data changes, stable across runs.
+
+    Functions inside the data are described by name and pushed onto stack
+    so that code_fingerprint hashes their source as well.
+    """
+    if isinstance(value, partial):
+        return (f"partial({describe_data(value.func, stack)}, {describe_data(value.args, stack)}, "
+                f"{describe_data(value.keywords, stack)})")
+    if isinstance(value, (types.ModuleType, type)):
+        return value.__name__
+    if callable(value):
+        stack.append(value)
+        return getattr(value, '__qualname__', type(value).__name__)
+    if isinstance(value, dict):
+        return "{" + ", ".join(f"{describe_data(key, stack)}: {describe_data(item, stack)}"
+                               for key, item in value.items()) + "}"
+    if isinstance(value, (list, tuple)):
+        return f"{type(value).__name__}({', '.join(describe_data(item, stack) for item in value)})"
+    if isinstance(value, (set, frozenset)):
+        return f"{type(value).__name__}({', '.join(sorted(describe_data(item, stack) for item in value))})"
+    if isinstance(value, np.ndarray):
+        return f"ndarray({value.dtype}, {value.shape}, {hashlib.sha256(value.tobytes()).hexdigest()})"
+    return repr(value)
+
+def function_module(function):
+    """Module a (possibly partial) generator function is defined in."""
+    while isinstance(function, partial):
+        function = function.func
+    return function.__module__
+
+def render_cache_key(wallpaper):
+    """Content key for a wallpaper: generator name, effective parameters and code version."""
+    function = wallpaper['function']
+    kwargs = job_kwargs(wallpaper)
+    target = function
+    while isinstance(target, partial):
+        kwargs = {**target.keywords, **kwargs}
+        target = target.func
+
+    params = inspect.signature(target).bind_partial(**kwargs)
+    params.apply_defaults()
+    key_material = {
+        'generator': target.__qualname__,
+        'params': {name: value for name, value in params.arguments.items()
+                   if name not in OUTPUT_NEUTRAL_PARAMS},
+        'code': code_fingerprint(function),
+    }
+    encoded = json.dumps(key_material, sort_keys=True, default=repr)
+    return hashlib.sha256(encoded.encode()).hexdigest()
+
+def _load_cache_index(cache_dir):
+    """Which cache key and content hash each output file was last written with."""
+    try:
+        with open(os.path.join(cache_dir, "index.json")) as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+def _save_cache_index(cache_dir, index):
+    with open(os.path.join(cache_dir, "index.json"), "w") as f:
+        json.dump(index, f, indent=2, sort_keys=True)
+
+def file_sha256(path):
+    """SHA-256 of a file's contents, read in chunks."""
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(partial(f.read, 1 << 20), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+def restore_from_cache(wallpaper, key, cache_dir=CACHE_DIR):
+    """
+    Makes the wallpaper's output file match the cache key without rendering.
+
+    Returns True when the output already holds that render or it could be
+    copied from the cache, False when the wallpaper has to be rendered. The
+    output only counts as holding the render while its contents still match
+    the hash recorded with the key, so an image replaced by a git checkout
+    or by hand is restored or re-rendered.
+    """
+    output_file = wallpaper['file']
+    entry = os.path.join(cache_dir, f"{key}.png")
+    index = _load_cache_index(cache_dir)
+    recorded = index.get(output_file)
+    if (isinstance(recorded, dict) and recorded.get('key') == key
+            and os.path.exists(output_file) and file_sha256(output_file) == recorded.get('sha256')):
+        if os.path.exists(entry):
+            os.utime(entry)
+        return True
+    if not os.path.exists(entry):
+        return False
+
+    shutil.copyfile(entry, output_file)
+    os.utime(entry)
+    index[output_file] = {'key': key, 'sha256': file_sha256(output_file)}
+    _save_cache_index(cache_dir, index)
+    return True
+
+def store_in_cache(wallpaper, key, cache_dir=CACHE_DIR):
+    """Files a freshly rendered output under its cache key."""
+    os.makedirs(cache_dir, exist_ok=True)
+    shutil.copyfile(wallpaper['file'], os.path.join(cache_dir, f"{key}.png"))
+    index = _load_cache_index(cache_dir)
+    index[wallpaper['file']] = {'key': key, 'sha256': file_sha256(wallpaper['file'])}
+    _save_cache_index(cache_dir, index)
+
+def evict_render_cache(cache_dir=CACHE_DIR, max_age_days=30, max_mb=2048):
+    """Drops cache entries unused for max_age_days, then the least recently used beyond max_mb."""
+    if not os.path.isdir(cache_dir):
+        return
+    entries = []
+    for name in os.listdir(cache_dir):
+        if name.endswith(".png"):
+            path = os.path.join(cache_dir, name)
+            stat = os.stat(path)
+            entries.append((stat.st_mtime, stat.st_size, path))
+    entries.sort(reverse=True)
+
+    cutoff = time.time() - max_age_days * 86400
+    total = 0
+    for mtime, size, path in entries:
+        total += size
+        if mtime < cutoff or total > max_mb * 1024 * 1024:
+            os.remove(path)
+
+def load_render_timings(path=TIMINGS_FILE):
+    """Load the wall times recorded by previous runs, keyed by wallpaper name."""
+    try:
+        with open(path) as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+def save_render_timings(timings, path=TIMINGS_FILE):
+    """Persist wall times so the next run can schedule the slowest jobs first."""
+    with open(path, "w") as f:
+        json.dump(timings, f, indent=2, sort_keys=True)
+
+def _peak_rss_mb():
+    """Peak resident set size of the current process in MB, if the OS reports it."""
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports kilobytes, macOS reports bytes
+    return peak / (1024 * 1024) if sys.platform == "darwin" else peak / 1024
+
+def _run_wallpaper_job(wallpaper, memory_budget_mb, conn):
+    """Worker process body: render one wallpaper and send back time, memory and errors."""
+    if memory_budget_mb and resource is not None:
+        limit = int(memory_budget_mb * 1024 * 1024)
+        # RLIMIT_DATA caps heap and anonymous mappings (numpy arrays) but not
+        # shared libraries or file-backed np.memmap buffers, so it tracks
+        # the peak RSS the job reports far better than RLIMIT_AS would
+        resource.setrlimit(resource.RLIMIT_DATA, (limit, limit))
+
+    start = time.perf_counter()
+    error = None
+    try:
+        wallpaper['function'](**job_kwargs(wallpaper))
+    except Exception as e:
+        error = f"{type(e).__name__}: {e}"
+
+    conn.send({
+        'seconds': time.perf_counter() - start,
+        'peak_rss_mb': _peak_rss_mb(),
+        'error': error,
+    })
+    conn.close()
+
+def run_wallpaper_jobs(wallpapers, workers=None, memory_budget_mb=None,
+                       timings_file=TIMINGS_FILE, cache_dir=CACHE_DIR):
+    """
+    Renders wallpapers in parallel, one fresh process per job.
+
+    Jobs start longest-first according to the timings recorded by earlier
+    runs; wallpapers without a recorded time go first. Each worker's private
+    data (heap and in-memory arrays, not memory-mapped files) can be capped
+    at memory_budget_mb on platforms with the resource module. A job that
+    raises, runs out of memory or crashes its process is reported as failed
+    without affecting the others.
+
+    With a cache_dir, wallpapers whose cache key (see render_cache_key) is
+    unchanged are restored or left alone instead of rendered, and new
+    renders are added to the cache. Pass cache_dir=None to render everything.
+
+    Returns one result dict per wallpaper with its wall time, peak RSS and
+    error (None on success), in completion order.
+    """
+    workers = workers or os.cpu_count() or 1
+    timings = load_render_timings(timings_file)
+    cache_keys = {}
+    if cache_dir:
+        fresh = []
+        for wallpaper in wallpapers:
+            key = render_cache_key(wallpaper)
+            if restore_from_cache(wallpaper, key, cache_dir):
+                print(f"♻️  {wallpaper['name']}: unchanged, skipped")
+            else:
+                cache_keys[wallpaper['name']] = key
+                fresh.append(wallpaper)
+        wallpapers = fresh
+
+    pending = deque(sorted(wallpapers, key=lambda w: timings.get(w['name'], float("inf")),
+                           reverse=True))
+    running = {}
+    results = []
+
+    while pending or running:
+        while pending and len(running) < workers:
+            wallpaper = pending.popleft()
+            receiver, sender = multiprocessing.Pipe(duplex=False)
+            process = multiprocessing.Process(target=_run_wallpaper_job,
+                                              args=(wallpaper, memory_budget_mb, sender))
+            process.start()
+            sender.close()
+            running[process.sentinel] = (process, receiver, wallpaper, time.perf_counter())
+            print(f"⏳ Started {wallpaper['name']}")
+
+        for sentinel in multiprocessing.connection.wait(list(running)):
+            process, receiver, wallpaper, started = running.pop(sentinel)
+            try:
+                result = receiver.recv()
+            except EOFError:
+                result = {
+                    'seconds': time.perf_counter() - started,
+                    'peak_rss_mb': None,
+                    'error': f"worker process died with exit code {process.exitcode}",
+                }
+            process.join()
+            receiver.close()
+            result['name'] = wallpaper['name']
+            results.append(result)
+
+            rss = f"{result['peak_rss_mb']:.0f} MB" if result['peak_rss_mb'] else "n/a"
+            if result['error'] is None:
+                timings[wallpaper['name']] = round(result['seconds'], 2)
+                if cache_dir:
+                    store_in_cache(wallpaper, cache_keys[wallpaper['name']], cache_dir)
+                print(f"✅ {wallpaper['name']}: {result['seconds']:.1f}s, peak RSS {rss}")
+            else:
+                print(f"❌ Error generating {wallpaper['name']} after "
+                      f"{result['seconds']:.1f}s (peak RSS {rss}): {result['error']}")
+
+    save_render_timings(timings, timings_file)
+    return results
+
+def write_sibling_images(wallpapers, siblings):
+    """
+    Encodes every rendered wallpaper in the sibling formats (e.g. webp, avif)
+    from its PNG. Siblings newer than their PNG are up to date and skipped,
+    so wallpapers restored unchanged from the render cache cost nothing.
+    """
+    for wallpaper in wallpapers:
+        source = wallpaper['file']
+        if not os.path.exists(source):
+            continue
+        img = None
+        for path in sibling_files(source, siblings):
+            if os.path.exists(path) and os.path.getmtime(path) >= os.path.getmtime(source):
+                continue
+            if img is None:
+                img = Image.open(source)
+                img.load()
+            save_image(img, path)
+            print(f"🖼️  {wallpaper['name']}: wrote {path}")
+
+def write_variant_images(wallpapers, variants, siblings):
+    """
+    Writes the downsized variants (thumb, 1080p, ...) of every rendered
+    wallpaper from its PNG, skipping wallpapers whose variants are all
+    newer than the PNG.
+    """
+    for wallpaper in wallpapers:
+        source = wallpaper['file']
+        if not os.path.exists(source):
+            continue
+        with Image.open(source) as img:
+            width = img.width
+        paths = [path for _, group in variant_files(source, width, variants, siblings)
+                 for path in group]
+        if all(os.path.exists(path) and os.path.getmtime(path) >= os.path.getmtime(source)
+               for path in paths):
+            continue
+        with Image.open(source) as img:
+            img.load()
+            save_variants(img, source, variants=variants, siblings=siblings)
+        print(f"🖼️  {wallpaper['name']}: wrote {len(paths)} variant(s)")
+
+def describe_image(path):
+    """File name, pixel size and file size of an image, as stored in the manifest."""
+    with Image.open(path) as img:
+        width, height = img.size
+    return {'file': os.path.basename(path), 'width': width, 'height': height,
+            'bytes': os.path.getsize(path)}
+
+def write_variant_manifest(wallpapers, variants, siblings, manifest_file=MANIFEST_FILE,
+                           script_file=MANIFEST_SCRIPT):
+    """
+    Records every image of each wallpaper for the web gallery.
+
+    The manifest maps a wallpaper's file name (the filename field of
+    js/wallpapers-data.js) to its size and a 'sources' list of the full image,
+    its siblings and its variants, narrowest first, each with width, height
+    and bytes. The same data is written to script_file as the global
+    wallpaperVariants, from which js/wallpaper-loader.js builds srcset.
+    """
+    manifest = {}
+    for wallpaper in wallpapers:
+        source = wallpaper['file']
+        if not os.path.exists(source):
+            continue
+        entry = describe_image(source)
+        paths = [source] + sibling_files(source, siblings)
+        paths += [path for _, group in variant_files(source, entry['width'], variants, siblings)
+                  for path in group]
+        sources = [describe_image(path) for path in paths if os.path.exists(path)]
+        entry['sources'] = sorted(sources, key=lambda image: image['width'])
+        manifest[entry.pop('file')] = entry
+
+    with open(manifest_file, "w") as f:
+        json.dump(manifest, f, indent=2, sort_keys=True)
+    with open(script_file, "w") as f:
+        f.write(f"// Generated by generate_wallpapers.py from {manifest_file}; do not edit.\n")
+        f.write(f"const wallpaperVariants = {json.dumps(manifest, indent=2, sort_keys=True)};\n\n")
+        f.write("if (typeof module !== 'undefined' && module.exports) {\n"
+                "    module.exports = { wallpaperVariants };\n}\n")
+    print(f"📋 Wrote {manifest_file} and {script_file}")
+    return manifest
+
+def write_gallery_srcset(manifest, page_file=GALLERY_PAGE):
+    """
+    Points the gallery page's <img src="wallpapers/..."> tags at the manifest.
+
+    Each tag gets srcset and sizes attributes listing the image and its
+    variants in the image's own format, so the browser downloads the
+    smallest file that fills the card instead of the full 4K image. The
+    attributes are rewritten on every run, and dropped for images the
+    manifest no longer lists.
+    """
+    linked = []
+
+    def add_srcset(match):
+        filename = match.group(1)
+        extension = os.path.splitext(filename)[1].lower()
+        sources = [image for image in manifest.get(filename, {}).get('sources', [])
+                   if os.path.splitext(image['file'])[1].lower() == extension]
+        tag = f'<img src="wallpapers/{filename}"'
+        if len(sources) < 2:
+            return tag
+        srcset = ", ".join(f"wallpapers/{image['file']} {image['width']}w" for image in sources)
+        linked.append(filename)
+        return f'{tag} srcset="{srcset}" sizes="{GALLERY_SIZES}"'
+
+    with open(page_file, encoding="utf-8") as f:
+        page = f.read()
+    page = re.sub(r'<img src="wallpapers/([^"]+)"(?: srcset="[^"]*" sizes="[^"]*")?',
+                  add_srcset, page)
+    with open(page_file, "w", encoding="utf-8") as f:
+        f.write(page)
+    print(f"📋 Added srcset to {len(linked)} gallery image(s) in {page_file}")
+
+def generate_sample_wallpapers(workers=None, memory_budget_mb=None, use_cache=True,
+                               cache_max_age_days=30, cache_max_mb=2048, siblings=(),
+                               variants=()):
     """Generate all available mathematical wallpapers"""
 
     create_wallpapers_directory()
+    configure_saving(siblings=siblings, variants=variants)
 
-    wallpapers_to_generate = [
-        # Original 6 wallpapers
-        {
-            'name': 'Mandelbrot Set',
-            'function': generate_mandelbrot_set,
-            'file': 'wallpapers/mandelbrot_set.png',
-            'description': 'The iconic Mandelbrot set fractal'
-        },
-        {
-            'name': 'Julia Set',
-            'function': generate_julia_set,
-            'file': 'wallpapers/julia_set.png',
-            'description': 'Beautiful Julia set fractal'
-        },
-        {
-            'name': 'Lorenz Attractor',
-            'function': generate_lorenz_attractor,
-            'file': 'wallpapers/lorenz_attractor.png',
-            'description': 'The famous butterfly effect attractor'
-        },
-        {
-            'name': 'Barnsley Fern',
-            'function': generate_barnsley_fern,
-            'file': 'wallpapers/barnsley_fern.png',
-            'description': 'Nature-inspired fractal fern'
-        },
-        {
-            'name': 'Clifford Attractor',
-            'function': generate_clifford_attractor,
-            'file': 'wallpapers/clifford_attractor.png',
-            'description': 'Mesmerizing strange attractor'
-        },
-        {
-            'name': 'Burning Ship',
-            'function': generate_burning_ship,
-            'file': 'wallpapers/burning_ship.png',
-            'description': 'Dramatic fractal with lava-like appearance'
-        },
-        # Additional wallpapers
-        {
-            'name': 'Random Math Art',
-            'function': generate_random_math_art,
-            'file': 'wallpapers/random_math_art.png',
-            'description': 'Random mathematical art using sine-cosine functions'
-        },
-        {
-            'name': 'De Jong Attractor',
-            'function': generate_dejong_attractor,
-            'file': 'wallpapers/dejong_attractor.png',
-            'description': 'De Jong attractor with beautiful gradient'
-        },
-        {
-            'name': 'Spirograph',
-            'function': generate_spirograph,
-            'file': 'wallpapers/spirograph.png',
-            'description': 'Beautiful spirograph pattern'
-        },
-        {
-            'name': 'Henon Attractor',
-            'function': generate_henon_attractor,
-            'file': 'wallpapers/henon_attractor.png',
-            'description': 'Hénon map attractor'
-        },
-        {
-            'name': 'Ikeda Attractor',
-            'function': generate_ikeda_attractor,
-            'file': 'wallpapers/ikeda_attractor.png',
-            'description': 'Ikeda map attractor'
-        },
-        {
-            'name': 'Lissajous Curve',
-            'function': generate_lissajous_curve,
-            'file': 'wallpapers/lissajous_curve.png',
-            'description': 'Lissajous curve with turquoise-magenta gradient'
-        },
-        {
-            'name': 'Rossler Attractor',
-            'function': generate_rossler_attractor,
-            'file': 'wallpapers/rossler_attractor.png',
-            'description': 'Stunning Rössler attractor with rainbow gradient'
-        },
-        {
-            'name': 'Thomas Attractor',
-            'function': generate_thomas_attractor,
-            'file': 'wallpapers/thomas_attractor.png',
-            'description': 'Beautiful Thomas attractor with electric blue gradient'
-        },
-        {
-            'name': 'Aizawa Attractor',
-            'function': generate_aizawa_attractor,
-            'file': 'wallpapers/aizawa_attractor.png',
-            'description': 'Mesmerizing Aizawa attractor with cosmic colors'
-        },
-        {
-            'name': 'Dadras Attractor',
-            'function': generate_dadras_attractor,
-            'file': 'wallpapers/dadras_attractor.png',
-            'description': 'Electric Dadras attractor with neon lightning effect'
-        },
-        {
-            'name': 'Chen Attractor',
-            'function': generate_chen_attractor,
-            'file': 'wallpapers/chen_attractor.png',
-            'description': 'Fiery Chen attractor with phoenix-like colors'
-        },
-        {
-            'name': 'Halvorsen Attractor',
-            'function': generate_halvorsen_attractor,
-            'file': 'wallpapers/halvorsen_attractor.png',
-            'description': 'Stunning Halvorsen attractor with aurora-like colors'
-        },
-        {
-            'name': 'Newton Fractal',
-            'function': generate_newton_fractal,
-            'file': 'wallpapers/newton_fractal.png',
-            'description': 'Beautiful Newton fractal with prismatic colors'
-        },
-        {
-            'name': 'Tricorn Fractal',
-            'function': generate_tricorn_fractal,
-            'file': 'wallpapers/tricorn_fractal.png',
-            'description': 'Crystalline Tricorn fractal with ice-like colors'
-        },
-        {
-            'name': 'Pickover Attractor',
-            'function': generate_pickover_attractor,
-            'file': 'wallpapers/pickover_attractor.png',
-            'description': 'Alien-like Pickover attractor with otherworldly colors'
-        },
-        {
-            'name': 'Gingerbreadman Map',
-            'function': generate_gingerbreadman_map,
-            'file': 'wallpapers/gingerbreadman_map.png',
-            'description': 'Whimsical Gingerbreadman map with warm cookie colors'
-        },
-        {
-            'name': 'Tinkerbell Map',
-            'function': generate_tinkerbell_map,
-            'file': 'wallpapers/tinkerbell_map.png',
-            'description': 'Magical Tinkerbell map with sparkling fairy dust colors'
-        },
-        {
-            'name': 'Four Wing Attractor',
-            'function': generate_four_wing_attractor,
-            'file': 'wallpapers/four_wing_attractor.png',
-            'description': 'Magnificent Four Wing attractor with butterfly-like colors'
-        }
-    ]
-    
     print("🎨 Generating Mathematical Wallpapers for Website...")
     print("=" * 60)
-    
-    for i, wallpaper in enumerate(wallpapers_to_generate, 1):
-        try:
-            print(f"\n📊 Generating {i}/{len(wallpapers_to_generate)}: {wallpaper['name']}")
-            print(f"Description: {wallpaper['description']}")
-            
-            # Generate with signature
-            wallpaper['function'](
-                output_file=wallpaper['file'],
-                add_signature=True
-            )
-            
-            print(f"✅ {wallpaper['name']} generated successfully!")
-            
-        except Exception as e:
-            print(f"❌ Error generating {wallpaper['name']}: {e}")
-    
+
+    cache_dir = CACHE_DIR if use_cache else None
+    results = run_wallpaper_jobs(WALLPAPERS, workers, memory_budget_mb, cache_dir=cache_dir)
+    if use_cache:
+        evict_render_cache(CACHE_DIR, cache_max_age_days, cache_max_mb)
+    failed = [result['name'] for result in results if result['error']]
+    if siblings:
+        write_sibling_images(WALLPAPERS, SAVE_SETTINGS['siblings'])
+    if variants:
+        write_variant_images(WALLPAPERS, SAVE_SETTINGS['variants'], SAVE_SETTINGS['siblings'])
+        manifest = write_variant_manifest(WALLPAPERS, SAVE_SETTINGS['variants'],
+                                          SAVE_SETTINGS['siblings'])
+        write_gallery_srcset(manifest)
+
     print("\n🎉 Wallpaper generation complete!")
+    if failed:
+        print(f"⚠️  {len(failed)} wallpaper(s) failed: {', '.join(failed)}")
     print("Check the 'wallpapers' directory for your mathematical art!")
+    return results
 
 if __name__ == "__main__":
-    generate_sample_wallpapers()
+    parser = argparse.ArgumentParser(description="Generate the website's wallpapers in parallel")
+    parser.add_argument("--workers", type=int, default=None,
+                        help="number of render processes (default: all cores)")
+    parser.add_argument("--memory-budget-mb", type=float, default=None,
+                        help="limit on each render process's private memory in MB "
+                             "(memory-mapped buffers do not count)")
+    parser.add_argument("--no-cache", action="store_true",
+                        help="re-render every wallpaper even if its inputs are unchanged")
+    parser.add_argument("--cache-max-age-days", type=float, default=30,
+                        help="evict cached renders unused for this long")
+    parser.add_argument("--cache-max-mb", type=float, default=2048,
+                        help="evict least recently used renders beyond this size")
+    parser.add_argument("--siblings", nargs="+", default=[], metavar="FORMAT",
+                        help="also encode every wallpaper in these formats, e.g. webp avif")
+    parser.add_argument("--variants", nargs="+", default=[], metavar="SIZE",
+                        choices=list(VARIANT_WIDTHS) + ["all"],
+                        help=f"write downsized copies, {MANIFEST_FILE} and srcset in "
+                             f"{GALLERY_PAGE}: {', '.join(VARIANT_WIDTHS)} or all")
+    args = parser.parse_args()
+    generate_sample_wallpapers(args.workers, args.memory_budget_mb, not args.no_cache,
+                               args.cache_max_age_days, args.cache_max_mb, args.siblings,
+                               args.variants)
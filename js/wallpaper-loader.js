@@ -71,6 +71,29 @@ class WallpaperLoader {
         }
     }
 
+    createImageSources(wallpaper) {
+        // Responsive sources from wallpaper-variants.js (written by generate_wallpapers.py --variants)
+        if (typeof wallpaperVariants === 'undefined' || !wallpaperVariants[wallpaper.filename]) {
+            return '';
+        }
+
+        const types = { avif: 'image/avif', webp: 'image/webp', png: 'image/png', jpg: 'image/jpeg' };
+        const srcsets = {};
+        wallpaperVariants[wallpaper.filename].sources.forEach(image => {
+            const extension = image.file.split('.').pop().toLowerCase();
+            if (types[extension]) {
+                (srcsets[extension] = srcsets[extension] || []).push(`wallpapers/${image.file} ${image.width}w`);
+            }
+        });
+
+        // Cards span the full width on small screens and half of the 1400px container from the lg breakpoint up
+        const sizes = '(min-width: 1400px) 700px, (min-width: 1024px) 50vw, 100vw';
+        return ['avif', 'webp', 'png', 'jpg']
+            .filter(extension => srcsets[extension])
+            .map(extension => `<source type="${types[extension]}" srcset="${srcsets[extension].join(', ')}" sizes="${sizes}">`)
+            .join('\n                ');
+    }
+
     createWallpaperCard(wallpaper) {
         const card = document.createElement('div');
         card.className = 'wallpaper-card notion-container rounded-xl overflow-hidden';
@@ -92,11 +115,14 @@ class WallpaperLoader {
 
         card.innerHTML = `
             <div class="card-image relative">
+                <picture>
+                ${this.createImageSources(wallpaper)}
                 <img src="wallpapers/${wallpaper.filename}" alt="${wallpaper.name}"
                      class="image-loading"
                      loading="lazy"
                      onload="this.classList.remove('image-loading'); this.classList.add('loaded');"
                      onerror="this.classList.remove('image-loading'); this.src='data:image/svg+xml;base64,PHN2ZyB3aWR0aD0iMzAwIiBoZWlnaHQ9IjIwMCIgeG1sbnM9Imh0dHA6Ly93d3cudzMub3JnLzIwMDAvc3ZnIj48cmVjdCB3aWR0aD0iMTAwJSIgaGVpZ2h0PSIxMDAlIiBmaWxsPSIjZjNmNGY2Ii8+PHRleHQgeD0iNTAlIiB5PSI1MCUiIGZvbnQtZmFtaWx5PSJBcmlhbCwgc2Fucy1zZXJpZiIgZm9udC1zaXplPSIxNCIgZmlsbD0iIzk5YTNhZiIgdGV4dC1hbmNob3I9Im1pZGRsZSIgZHk9Ii4zZW0iPkltYWdlIE5vdCBGb3VuZDwvdGV4dD48L3N2Zz4='; this.classList.add('loaded');">
+                </picture>
                 <div class="absolute top-4 right-4 z-10">
                     <span class="bg-${wallpaper.color}-600 text-white px-3 py-1 rounded-full text-sm font-medium shadow-lg backdrop-blur-sm">
                         ${wallpaper.category}